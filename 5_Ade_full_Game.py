@@ -118,59 +118,170 @@ Usage:
 """
 
 import random
+import sys
 import unittest
 import os
 
+import hangman_metrics as metrics
+from hangman_compiled import CompiledDictionary, is_compiled
+from hangman_engine import LETTER_BITS, HangmanEngine, sorted_letters
+from hangman_gameid import game_parameters
+from hangman_shuffle import ShuffleBag
+from hangman_utils import validate_word
+from hangman_wordfile import WordFile
+
 # =============================================================================
 # Person 1 (Julie): Word Management and Game State
 # =============================================================================
 
+class WordSource:
+    """Everything select_word draws from, replaced as one object on reload"""
+    __slots__ = ('words', 'difficulty', 'weights', 'bag')
+
+    def __init__(self, words, difficulty=None, weights=None, bag=None):
+        self.words = words
+        self.difficulty = difficulty  # optional DifficultyIndex over words
+        self.weights = weights  # optional AliasTable over words
+        self.bag = bag  # optional ShuffleBag: no repeats until every word was played
+
+
 class WordManager:
-    def __init__(self, words=None):
-        self.words = words if words else ["challenge", "galaxy", "adventure", "puzzle", "mystery", "fantasy", "treasure", "enchanted"]
-        self.selected_word = ""
-        self.revealed_letters = []
+    def __init__(self, words=None, engine=None, difficulty=None, weights=None, bag=None,
+                 tries_range=(6, 6)):
+        words = words if words else ["challenge", "galaxy", "adventure", "puzzle", "mystery", "fantasy", "treasure", "enchanted"]
+        self.source = WordSource(words, difficulty, weights, bag)
+        self.engine = engine if engine is not None else HangmanEngine()
+        self.tries_range = tries_range  # max_tries range for games started by id
+    
+    @property
+    def words(self):
+        return self.source.words
+    
+    @property
+    def difficulty(self):
+        return self.source.difficulty
+    
+    @property
+    def weights(self):
+        return self.source.weights
+    
+    @property
+    def bag(self):
+        return self.source.bag
+    
+    @property
+    def selected_word(self):
+        return self.engine.word
     
-    def select_word(self):
-        self.selected_word = random.choice(self.words)
-        self.revealed_letters = ["_" for _ in self.selected_word]
+    @property
+    def revealed_letters(self):
+        return self.engine.revealed_letters()
     
+    def select_word(self, min_difficulty=None, max_difficulty=None, game_id=None):
+        # Read once: a concurrent use() swaps the whole source, never parts of it
+        source = self.source
+        words = source.words
+        if game_id is not None:
+            # Same word and max_tries on every node for the same id, as
+            # hangman_gameid.replay derives them
+            params = game_parameters(game_id, len(words), self.tries_range)
+            self.engine.start(words[params['word_id']], max_tries=params['max_tries'],
+                              word_id=params['word_id'])
+            return
+        if min_difficulty is not None or max_difficulty is not None:
+            if source.difficulty is None:
+                raise ValueError("Difficulty selection needs a DifficultyIndex")
+            word_id = source.difficulty.select(min_difficulty, max_difficulty)
+        elif source.bag is not None:
+            word_id = source.bag.draw()
+        elif source.weights is not None:
+            word_id = source.weights.draw()
+        else:
+            word_id = random.randrange(len(words))
+        self.engine.start(words[word_id], word_id=word_id)
+
+    def use(self, version):
+        """Switch to a reloaded DictionaryVersion; the current game keeps its word"""
+        difficulty, bag = self.source.difficulty, self.source.bag
+        if difficulty is not None:
+            # Scores are kept by word; only the word ids change
+            difficulty = difficulty.reindex(version.words)
+        if bag is not None:
+            # Keep the player's place in the rotation; only the size changes
+            bag = ShuffleBag(len(version.words), seed=bag.seed, drawn=bag.drawn)
+        self.source = WordSource(version.words, difficulty, version.weights, bag)
+
     def reveal_letter(self, letter):
-        for idx, char in enumerate(self.selected_word):
-            if char == letter:
-                self.revealed_letters[idx] = letter
+        self.engine.reveal(letter)
     
     def is_word_complete(self):
-        return "_" not in self.revealed_letters
+        return self.engine.is_won()
     
     def get_display_word(self):
-        return " ".join(self.revealed_letters)
+        return self.engine.display_word()
 
 
 class GameState:
-    def __init__(self, max_tries=6):
+    def __init__(self, max_tries=6, engine=None, word_manager=None):
+        """
+        Args:
+            max_tries (int): Wrong guesses allowed in the game
+            engine (HangmanEngine): Shared engine to view
+            word_manager (WordManager): Bind to this manager's engine now;
+                without engine or word_manager the state binds to the
+                manager passed to its first call
+        """
         self.max_tries = max_tries
-        self.remaining_tries = max_tries
-        self.guessed_letters = set()
+        if word_manager is not None:
+            engine = word_manager.engine
+        self._bound = engine is not None
+        self.engine = engine if engine is not None else HangmanEngine(max_tries)
+    
+    @property
+    def remaining_tries(self):
+        return self.engine.remaining_tries
+    
+    @remaining_tries.setter
+    def remaining_tries(self, value):
+        self.engine.remaining_tries = value
+    
+    @property
+    def guessed_letters(self):
+        return self.engine.guessed_letters
+    
+    def _bind(self, word_manager):
+        # Runs once: adopt the manager's engine with this state's max_tries,
+        # keeping any wrong guesses already made in its current game.
+        engine = word_manager.engine
+        misses = engine.max_tries - engine.remaining_tries
+        engine.max_tries = self.max_tries
+        engine.remaining_tries = self.max_tries - misses
+        self.engine = engine
+        self._bound = True
+        return engine
     
     def guess_letter(self, letter, word_manager):
-        if letter in self.guessed_letters:
+        engine = self.engine if self._bound else self._bind(word_manager)
+        try:
+            bit = LETTER_BITS[letter]
+        except KeyError:
+            # Uppercase and other input off the lowercase fast path
+            letter = letter.lower()
+            bit = LETTER_BITS.get(letter)
+            if bit is None:
+                # Not a-z: no mask bit, so it reveals or costs a try every time
+                return engine.guess(letter)
+        if engine.guessed & bit:
             return False  # Letter already guessed
-        
-        self.guessed_letters.add(letter)
-        
-        if letter in word_manager.selected_word:
-            word_manager.reveal_letter(letter)
-            return True
-        else:
-            self.remaining_tries -= 1
-            return False
+        return engine.guess(letter)
     
     def is_game_over(self, word_manager):
-        return self.remaining_tries == 0 or word_manager.is_word_complete()
+        engine = self.engine if self._bound else self._bind(word_manager)
+        return engine.revealed == engine.full_mask or engine.remaining_tries <= 0
     
     def is_winner(self, word_manager):
-        return word_manager.is_word_complete()
+        engine = self.engine if self._bound else self._bind(word_manager)
+        return engine.revealed == engine.full_mask
 
 
 # =============================================================================
@@ -178,7 +289,18 @@ class GameState:
 # =============================================================================
 
 class Display:
-    def __init__(self):
+    CLEAR_SCREEN = "\033[H\033[2J"
+
+    def __init__(self, redraw=False, stream=None):
+        """
+        Args:
+            redraw (bool): Redraw each turn in place using ANSI cursor control
+            stream: Text stream to write turns to (defaults to sys.stdout)
+        """
+        self.redraw = redraw
+        self.stream = stream
+        self._guessed_mask = 0
+        self._guessed_text = ""
         self.hangman_stages = [
             """
                -----
@@ -244,6 +366,29 @@ class Display:
             =========
             """
         ]
+        self._frames = [stage + "\n" for stage in self.hangman_stages]
+
+    def _guessed_string(self, game_state):
+        # Re-joined only when the guessed mask changes; bit order is already sorted
+        mask = game_state.engine.guessed
+        if mask != self._guessed_mask:
+            self._guessed_mask = mask
+            self._guessed_text = ", ".join(sorted_letters(mask))
+        return self._guessed_text
+
+    def render_turn(self, game_state, word_manager):
+        """Compose the hangman, word, guessed letters and tries into one string"""
+        return (f"{self.CLEAR_SCREEN if self.redraw else ''}"
+                f"{self._frames[6 - game_state.remaining_tries]}"
+                f"Current word: {word_manager.get_display_word()}\n"
+                f"Guessed letters: {self._guessed_string(game_state)}\n"
+                f"Remaining tries: {game_state.remaining_tries}\n")
+
+    def show_turn(self, game_state, word_manager):
+        """Write a whole turn with a single write and flush"""
+        stream = self.stream or sys.stdout
+        stream.write(self.render_turn(game_state, word_manager))
+        stream.flush()
 
     def display_hangman(self, tries_remaining):
         print(self.hangman_stages[6 - tries_remaining])
@@ -272,31 +417,78 @@ class Display:
 # =============================================================================
 
 class GameLogic:
-    def __init__(self):
+    def __init__(self, engine=None, lexicon=None, log=None, session_id=None):
         """
         Initialize the game logic with default values.
         The actual values will be set when starting a new game.
+        
+        Args:
+            engine (HangmanEngine): Shared engine to view; a private one
+                is created when omitted
+            lexicon: Dictionary full-word guesses must belong to, e.g. a
+                hangman_bloom.Lexicon; if omitted, any alphabetic word of
+                the right length is accepted
+            log: hangman_eventlog.EventLog that the engine's games and
+                guesses are appended to, including a game already started
+                on it; nothing is logged if omitted
+            session_id (int): Session to log under; allocated from the
+                log on the first logged start if omitted
         """
-        self.word = ""
-        self.word_state = []
-        self.guessed_letters = set()
-        self.remaining_tries = 6
-        self.game_won = False
-        self.game_over = False
-
-    def start_new_game(self, word):
+        self.engine = engine if engine is not None else HangmanEngine()
+        self.lexicon = lexicon
+        self.log = log
+        self.recorder = None
+        if log is not None:
+            self.recorder = self.engine.recorder = log.recorder(session_id)
+            if self.engine.word:
+                # Started before the log was attached, e.g. by WordManager.select_word
+                self.recorder.started(self.engine)
+
+    @property
+    def session_id(self):
+        return self.recorder.session_id if self.recorder is not None else None
+
+    @property
+    def word(self):
+        return self.engine.word
+
+    @property
+    def word_state(self):
+        return self.engine.revealed_letters()
+
+    @property
+    def guessed_letters(self):
+        return self.engine.guessed_letters
+
+    @guessed_letters.setter
+    def guessed_letters(self, letters):
+        self.engine.guessed_letters = letters
+
+    @property
+    def remaining_tries(self):
+        return self.engine.remaining_tries
+
+    @remaining_tries.setter
+    def remaining_tries(self, value):
+        self.engine.remaining_tries = value
+
+    @property
+    def game_won(self):
+        return self.engine.game_won
+
+    @property
+    def game_over(self):
+        return self.engine.game_over
+
+    def start_new_game(self, word, word_id=None):
         """
         Start a new game with the given word.
         
         Args:
             word (str): The word to be guessed
+            word_id (int): Index of the word in its word list, if known
         """
-        self.word = word.lower()
-        self.word_state = ['_' for _ in word]
-        self.guessed_letters = set()
-        self.remaining_tries = 6
-        self.game_won = False
-        self.game_over = False
+        self.engine.start(word, max_tries=6, word_id=word_id)
 
     def validate_guess(self, guess):
         """
@@ -308,13 +500,7 @@ class GameLogic:
         Returns:
             tuple: (bool, str) - (is_valid, error_message)
         """
-        if not guess.isalpha():
-            return False, "Please enter a letter."
-        if len(guess) != 1:
-            return False, "Please enter a single letter."
-        if guess.lower() in self.guessed_letters:
-            return False, "You already guessed that letter."
-        return True, ""
+        return self.engine.validate_guess(guess)
 
     def make_guess(self, guess):
         """
@@ -326,18 +512,46 @@ class GameLogic:
         Returns:
             tuple: (bool, str) - (is_correct, message)
         """
-        guess = guess.lower()
-        self.guessed_letters.add(guess)
+        letter = guess.lower()
+        correct = self.engine.guess(letter)
+        if correct:
+            return True, "Correct guess!"
+        return False, "Incorrect guess!"
+
+    def validate_word_guess(self, guess):
+        """
+        Validate a full-word guess.
+        
+        Args:
+            guess (str): The word guessed by the player
+            
+        Returns:
+            tuple: (bool, str) - (is_valid, error_message)
+        """
+        word = guess.lower()
+        guessed_words = self.engine.guessed_words
+        if not validate_word(word, guessed_words, len(self.engine.word)):
+            if word in guessed_words:
+                return False, "You already guessed that word."
+            return False, f"Please enter a {len(self.engine.word)}-letter word."
+        if self.lexicon is not None and word not in self.lexicon:
+            return False, "That is not a word in the dictionary."
+        return True, ""
+
+    def make_word_guess(self, guess):
+        """
+        Process a full-word guess; a wrong word costs one try.
         
-        if guess in self.word:
-            # Update word state with correct guess
-            for i, letter in enumerate(self.word):
-                if letter == guess:
-                    self.word_state[i] = guess
+        Args:
+            guess (str): The word guessed by the player
+            
+        Returns:
+            tuple: (bool, str) - (is_correct, message)
+        """
+        correct = self.engine.guess_word(guess)
+        if correct:
             return True, "Correct guess!"
-        else:
-            self.remaining_tries -= 1
-            return False, "Incorrect guess!"
+        return False, "Incorrect guess!"
 
     def update_game_status(self):
         """
@@ -346,18 +560,11 @@ class GameLogic:
         Returns:
             tuple: (bool, str) - (is_game_over, status_message)
         """
-        # Check for win condition
-        if '_' not in self.word_state:
-            self.game_won = True
-            self.game_over = True
+        if not self.engine.update_status():
+            return False, f"Remaining tries: {self.engine.remaining_tries}"
+        if self.engine.game_won:
             return True, "Congratulations! You won!"
-        
-        # Check for loss condition
-        if self.remaining_tries <= 0:
-            self.game_over = True
-            return True, f"Game Over! The word was: {self.word}"
-        
-        return False, f"Remaining tries: {self.remaining_tries}"
+        return True, f"Game Over! The word was: {self.engine.word}"
 
     def get_game_state(self):
         """
@@ -366,13 +573,7 @@ class GameLogic:
         Returns:
             dict: Current game state information
         """
-        return {
-            'word_state': ' '.join(self.word_state),
-            'guessed_letters': sorted(list(self.guessed_letters)),
-            'remaining_tries': self.remaining_tries,
-            'game_over': self.game_over,
-            'game_won': self.game_won
-        }
+        return self.engine.game_state()
 
     def retry_game(self):
         """
@@ -381,9 +582,7 @@ class GameLogic:
         Returns:
             bool: True if retry is possible
         """
-        if self.game_over:
-            return True
-        return False
+        return self.engine.game_over
 
 
 # =============================================================================
@@ -398,9 +597,8 @@ class HangmanGame:
     def __init__(self, word_list=None):
         self.word_manager = WordManager(word_list)
         self.word_manager.select_word()
-        self.game_state = GameState()
-        self.game_logic = GameLogic()
-        self.game_logic.start_new_game(self.word_manager.selected_word)
+        self.game_state = GameState(engine=self.word_manager.engine)
+        self.game_logic = GameLogic(engine=self.word_manager.engine)
     
     def guess(self, letter):
         # Validate input
@@ -419,17 +617,19 @@ class HangmanGame:
     
     @staticmethod
     def load_words(filename):
-        """Load words from a file."""
+        """
+        Load words from a file.
+        
+        Returns a memory-mapped WordFile sequence: lines are validated with
+        the same isalpha rule but only decoded when a word is picked.
+        Dictionaries built by hangman_compiled.py are opened as-is.
+        """
         try:
-            with open(filename, 'r') as f:
-                words = [line.strip() for line in f if line.strip().isalpha()]
-            
-            if not words:
-                raise ValueError("File contains no valid words")
-                
-            return words
+            if is_compiled(filename):
+                return CompiledDictionary(filename)
         except FileNotFoundError:
             raise FileNotFoundError(f"Word file '{filename}' not found")
+        return WordFile(filename)
 
 
 class TestHangmanGame(unittest.TestCase):
@@ -515,7 +715,20 @@ def run_tests():
     return result.wasSuccessful()
 
 
-def main():
+def enable_metrics():
+    """Turn on phase timings and counters for main() and the game classes."""
+    metrics.enable()
+    metrics.instrument(WordManager, {'select_word': 'word_selection'})
+    metrics.instrument(GameState, {'guess_letter': 'guess_processing',
+                                   'is_game_over': 'status_update'})
+    metrics.instrument(GameLogic, {'validate_guess': 'validation',
+                                   'validate_word_guess': 'validation',
+                                   'make_guess': 'guess_processing',
+                                   'make_word_guess': 'guess_processing',
+                                   'update_game_status': 'status_update'})
+
+
+def main(stats=None, player=None, lexicon=None):
     """
     Main game loop that coordinates all components.
     
@@ -524,6 +737,12 @@ def main():
     2. Manages the game flow
     3. Handles user interaction
     4. Controls game restart
+    
+    Args:
+        stats (hangman_stats.StatsStore): Records every finished game if given
+        player (str): Name the games are recorded under
+        lexicon (hangman_bloom.Lexicon): Enables full-word guesses, which
+            must be words in it; without one only letters are accepted
     """
     # Welcome message
     print("\n===== HANGMAN GAME =====")
@@ -533,7 +752,7 @@ def main():
     word_list = ["challenge", "galaxy", "adventure", "puzzle", "mystery", 
                 "fantasy", "treasure", "enchanted", "python", "journey",
                 "victory", "champion", "knowledge", "discovery", "imagination"]
-    word_manager = WordManager(word_list)
+    word_manager = WordManager(word_list, bag=ShuffleBag(len(word_list)))
     display = Display()
     
     play_again = True
@@ -542,34 +761,38 @@ def main():
     while play_again:
         # Start a new game
         word_manager.select_word()
-        game_state = GameState()
-        game_logic = GameLogic()
-        game_logic.start_new_game(word_manager.selected_word)
+        game_state = GameState(engine=word_manager.engine)
+        game_logic = GameLogic(engine=word_manager.engine, lexicon=lexicon)
         
         print("\nA new game has started!")
         
         # Game round loop
         while not game_state.is_game_over(word_manager):
             # Display current game state
-            display.display_hangman(game_state.remaining_tries)
-            display.show_word_state(word_manager)
-            display.show_guessed_letters(game_state)
-            display.display_remaining_tries(game_state)
+            with metrics.timer('rendering'):
+                display.show_turn(game_state, word_manager)
             
             # Get and validate user input
-            user_guess = display.handle_user_input()
+            with metrics.timer('input_wait'):
+                user_guess = display.handle_user_input()
             
-            is_valid, error_message = game_logic.validate_guess(user_guess)
+            # With a lexicon, more than one character is a guess at the whole word
+            word_guess = lexicon is not None and len(user_guess) > 1
+            if word_guess:
+                is_valid, error_message = game_logic.validate_word_guess(user_guess)
+            else:
+                is_valid, error_message = game_logic.validate_guess(user_guess)
             if not is_valid:
+                metrics.count('invalid_inputs')
                 print(error_message)
                 continue
             
-            # Process the guess
-            result = game_state.guess_letter(user_guess, word_manager)
-            
-            # Update GameLogic state to match GameState for validation
-            game_logic.guessed_letters = game_state.guessed_letters
-            game_logic.remaining_tries = game_state.remaining_tries
+            # Process the guess (all components view the same engine)
+            if word_guess:
+                result, _ = game_logic.make_word_guess(user_guess)
+            else:
+                result = game_state.guess_letter(user_guess, word_manager)
+            metrics.count('guesses')
             
             # Display result of the guess
             if result:
@@ -578,18 +801,31 @@ def main():
                 print("Incorrect guess!")
         
         # Game over - display final result
-        display.display_hangman(game_state.remaining_tries)
-        display.show_word_state(word_manager)
+        with metrics.timer('rendering'):
+            display.display_hangman(game_state.remaining_tries)
+            display.show_word_state(word_manager)
         
-        if game_state.is_winner(word_manager):
+        won = game_state.is_winner(word_manager)
+        if won:
+            metrics.count('wins')
             display.display_victory_message()
         else:
+            metrics.count('losses')
             display.display_defeat_message(word_manager)
+        if stats is not None:
+            # Only updates memory; the store writes to disk in the background
+            stats.record_game(player, word_manager.selected_word, won,
+                              word_manager.engine.max_tries - game_state.remaining_tries)
         
         # Ask to play again
         play_again_input = input("\nDo you want to play again? (y/n): ").lower()
         play_again = play_again_input.startswith('y')
     
+    if stats is not None:
+        stats.flush()  # The board counts games once they are written
+        print("\nLeaderboard:")
+        for rank, (name, wins) in enumerate(stats.leaderboard(), 1):
+            print(f"{rank}. {name} - {wins} wins")
     print("\nThanks for playing Hangman! Goodbye!\n")
 
 
@@ -598,5 +834,34 @@ if __name__ == "__main__":
     # Uncomment the next line to run tests first
     # run_tests()
     
+    # Set HANGMAN_METRICS and/or HANGMAN_PROFILE to instrument the run
+    metrics_path = os.environ.get("HANGMAN_METRICS")
+    profile_path = os.environ.get("HANGMAN_PROFILE")
+    if metrics_path:
+        enable_metrics()
+    entry_point = metrics.profiled(main, profile_path) if profile_path else main
+    
+    # Set HANGMAN_STATS to a SQLite file to keep player statistics
+    stats_path = os.environ.get("HANGMAN_STATS")
+    stats = None
+    if stats_path:
+        from hangman_stats import StatsStore
+        stats = StatsStore(stats_path)
+    
+    # Set HANGMAN_LEXICON to a hangman_bloom.py lexicon to allow word guesses
+    lexicon_path = os.environ.get("HANGMAN_LEXICON")
+    lexicon = None
+    if lexicon_path:
+        from hangman_bloom import Lexicon
+        lexicon = Lexicon.load(lexicon_path)
+    
     # Start the game
-    main()
+    try:
+        entry_point(stats, os.environ.get("HANGMAN_PLAYER", "player"), lexicon)
+    finally:
+        if metrics_path:
+            metrics.dump(metrics_path)
+        if stats is not None:
+            stats.close()
+        if lexicon is not None:
+            lexicon.close()
@@ -0,0 +1,98 @@
+"""
+Vectorized hangman for many concurrent games.
+
+BatchGames keeps N games as NumPy arrays and applies one guess per game
+in a single vectorized step, following the same rules as
+GameLogic.make_guess followed by GameLogic.update_game_status. Guesses
+that GameLogic.validate_guess would reject (repeats) and guesses for
+finished games are ignored.
+"""
+import numpy as np
+
+from hangman_engine import ORD_A, letters_from_mask
+
+MAX_WORD_LENGTH = 63
+
+
+class WordTable:
+    """Per-word letter -> position masks, shared by every batch over a word list"""
+
+    def __init__(self, words):
+        self.words = [word.lower() for word in words]
+        self.position_masks = np.zeros((len(self.words), 26), dtype=np.int64)
+        self.full_masks = np.zeros(len(self.words), dtype=np.int64)
+        for w, word in enumerate(self.words):
+            if len(word) > MAX_WORD_LENGTH or not (word.isascii() and word.isalpha()):
+                raise ValueError(f"Word cannot be batched: {word!r}")
+            for i, letter in enumerate(word):
+                self.position_masks[w, ord(letter) - ORD_A] |= 1 << i
+            self.full_masks[w] = (1 << len(word)) - 1
+
+
+class BatchGames:
+    def __init__(self, table, word_indices, max_tries=6):
+        """
+        Start one game per entry of word_indices.
+
+        Args:
+            table (WordTable): Compiled word list
+            word_indices (array-like): Index into table.words for each game
+            max_tries (int): Wrong guesses allowed per game
+        """
+        self.table = table
+        self.max_tries = max_tries
+        self.word_index = np.asarray(word_indices, dtype=np.int64)
+        n = len(self.word_index)
+        self.full_mask = table.full_masks[self.word_index]
+        self.guessed = np.zeros(n, dtype=np.int32)
+        self.revealed = np.zeros(n, dtype=np.int64)
+        self.remaining_tries = np.full(n, max_tries, dtype=np.int16)
+        self.game_won = self.full_mask == 0
+        self.game_over = self.game_won.copy()
+
+    @classmethod
+    def random(cls, table, count, seed=None, max_tries=6):
+        """Start count games on uniformly drawn words"""
+        rng = np.random.default_rng(seed)
+        return cls(table, rng.integers(0, len(table.words), count), max_tries)
+
+    def step(self, guesses):
+        """
+        Apply one guess to every game.
+
+        Args:
+            guesses (array-like): Letter index 0-25 per game, or -1 to skip
+
+        Returns:
+            numpy.ndarray: bool per game - True where the guess was correct
+        """
+        guesses = np.asarray(guesses, dtype=np.int64)
+        bits = np.left_shift(1, np.clip(guesses, 0, 25)).astype(np.int32)
+        active = (guesses >= 0) & ~self.game_over & ((self.guessed & bits) == 0)
+
+        self.guessed |= np.where(active, bits, 0).astype(np.int32)
+        hits = self.table.position_masks[self.word_index, np.clip(guesses, 0, 25)]
+        correct = active & (hits != 0)
+        self.revealed |= np.where(correct, hits, 0)
+        self.remaining_tries -= (active & ~correct).astype(np.int16)
+
+        self.game_won |= self.revealed == self.full_mask
+        self.game_over |= self.game_won | (self.remaining_tries <= 0)
+        return correct
+
+    @staticmethod
+    def letters_to_indices(letters):
+        """Convert a string or sequence of letters to a guess vector"""
+        return np.fromiter((ord(letter) - ORD_A for letter in letters), dtype=np.int64)
+
+    def get_game_state(self, i):
+        """Return game i in the same form as GameLogic.get_game_state"""
+        word = self.table.words[self.word_index[i]]
+        revealed = int(self.revealed[i])
+        return {
+            'word_state': ' '.join(char if revealed >> j & 1 else '_' for j, char in enumerate(word)),
+            'guessed_letters': sorted(letters_from_mask(int(self.guessed[i]))),
+            'remaining_tries': int(self.remaining_tries[i]),
+            'game_over': bool(self.game_over[i]),
+            'game_won': bool(self.game_won[i])
+        }
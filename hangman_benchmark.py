@@ -0,0 +1,175 @@
+"""
+Benchmarks for the game hot paths.
+
+Times WordManager.select_word, GameState.guess_letter,
+GameLogic.make_guess/update_game_status/get_game_state,
+hangman_utils.get_display, Display rendering and HangmanGame.load_words
+for dictionaries from words.txt (16 words) up to 1M generated words.
+Results are written as JSON ({benchmark: {size: ns per operation}}) and
+can be compared against a stored baseline.
+
+Usage:
+    python hangman_benchmark.py [--sizes 16 1000 1000000] [--output bench.json]
+    python hangman_benchmark.py --compare baseline.json [--threshold 0.2]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import hangman_utils
+from hangman_utils import load_game_module
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+DEFAULT_SIZES = [16, 1000, 10000, 100000, 1000000]
+
+
+def make_words(size, seed=0):
+    """words.txt for size 16, otherwise size generated lowercase words"""
+    if size == 16:
+        with open(os.path.join(HERE, "words.txt")) as f:
+            return f.read().split()
+    rng = random.Random(seed)
+    return [''.join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 12)))
+            for _ in range(size)]
+
+
+def measure(func, ops_per_call=1, min_time=0.2, repeat=5):
+    """
+    Time func and return the best nanoseconds per operation.
+
+    Args:
+        func (callable): Performs ops_per_call operations per call
+        ops_per_call (int): Operations done by one call of func
+        min_time (float): Seconds each timing round should at least take
+        repeat (int): Rounds to run; the fastest one is reported
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        number *= 10
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e9 / (number * ops_per_call)
+
+
+def benchmarks(game, words, word_file):
+    """Return {name: (callable, ops_per_call)} for one dictionary"""
+    word_manager = game.WordManager(words)
+    word_manager.select_word()
+    word = word_manager.selected_word
+    game_state = game.GameState(engine=word_manager.engine)
+    game_logic = game.GameLogic()
+    game_logic.start_new_game(word)
+    display = game.Display(stream=io.StringIO())
+    shown = game.WordManager([word])
+    shown.select_word()
+    shown_state = game.GameState(engine=shown.engine)
+    for letter in word[:2] + "z":
+        shown_state.guess_letter(letter, shown)
+    guessed = set(word[::2])
+
+    def guess_letter():
+        word_manager.engine.start(word)
+        for letter in ALPHABET:
+            game_state.guess_letter(letter, word_manager)
+
+    def make_guess():
+        game_logic.start_new_game(word)
+        for letter in ALPHABET:
+            game_logic.make_guess(letter)
+            game_logic.update_game_status()
+
+    def show_turn():
+        display.stream.seek(0)
+        display.show_turn(shown_state, shown)
+
+    def print_turn():
+        with contextlib.redirect_stdout(io.StringIO()):
+            display.display_hangman(shown_state.remaining_tries)
+            display.show_word_state(shown)
+            display.show_guessed_letters(shown_state)
+            display.display_remaining_tries(shown_state)
+
+    return {
+        "WordManager.select_word": (word_manager.select_word, 1),
+        "GameState.guess_letter": (guess_letter, len(ALPHABET)),
+        "GameLogic.make_guess+update_game_status": (make_guess, len(ALPHABET)),
+        "GameLogic.get_game_state": (game_logic.get_game_state, 1),
+        "hangman_utils.get_display": (lambda: hangman_utils.get_display(word, guessed), 1),
+        "Display.show_turn": (show_turn, 1),
+        "Display.print_turn": (print_turn, 1),
+        "HangmanGame.load_words": (lambda: game.HangmanGame.load_words(word_file), 1),
+    }
+
+
+def run(sizes, min_time=0.2):
+    game = load_game_module()
+    results = {}
+    for size in sizes:
+        words = make_words(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            word_file = os.path.join(tmp, "words.txt")
+            with open(word_file, "w") as f:
+                f.write("\n".join(words))
+            for name, (func, ops) in benchmarks(game, words, word_file).items():
+                # Loading a large file once per round is already slow enough
+                rounds = min_time if name != "HangmanGame.load_words" else 0
+                ns = measure(func, ops, min_time=rounds)
+                results.setdefault(name, {})[str(size)] = ns
+                print(f"{name:45} {size:>8} {ns:14.1f} ns/op", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compare results against a baseline.
+
+    Returns:
+        list: (name, size, baseline_ns, ns) for every slowdown over threshold
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for size, ns in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if base and ns > base * (1 + threshold):
+                regressions.append((name, size, base, ns))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the hangman hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against this file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.min_time)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, size, base, ns in regressions:
+            print(f"REGRESSION {name} @ {size}: {base:.1f} -> {ns:.1f} ns/op "
+                  f"({ns / base - 1:+.0%})")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,161 @@
+"""
+Bloom-filter-backed dictionary checks for full-word guesses.
+
+BloomFilter is built once from a large validation lexicon and saved to
+disk; loading maps the bit array read-only, so every worker shares the
+same pages instead of holding the lexicon in a Python set. Lexicon
+answers definite negatives from the filter in O(1) and confirms
+positives against an exact index to rule out false positives.
+
+build_lexicon() saves that exact index next to the filter as a sorted
+hangman_compiled dictionary (lexicon.bloom -> lexicon.hgd), which
+Lexicon.load() maps as well and searches by bisection, so neither part
+of the lexicon is rebuilt or copied per process.
+
+Usage:
+    python hangman_bloom.py lexicon.txt lexicon.bloom
+"""
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+
+from hangman_compiled import CompiledDictionary, compile_words
+
+MAGIC = b'HGBLOOM1'
+HEADER = struct.Struct('<8sQII')
+
+
+def _hashes(word):
+    digest = hashlib.blake2b(word.lower().encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class BloomFilter:
+    def __init__(self, bit_count, hash_count, bits=None, count=0):
+        """
+        Args:
+            bit_count (int): Size of the bit array
+            hash_count (int): Bits set per word
+            bits: Existing bit array (bytearray or read-only mmap)
+            count (int): Words already added
+        """
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.01):
+        """Size a filter for capacity words at the given false positive rate"""
+        bit_count = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(bit_count / max(capacity, 1) * math.log(2)))
+        return cls(bit_count, hash_count)
+
+    def _positions(self, word):
+        h1, h2 = _hashes(word)
+        return ((h1 + i * h2) % self.bit_count for i in range(self.hash_count))
+
+    def add(self, word):
+        for position in self._positions(word):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, word):
+        bits = self.bits
+        return all(bits[position >> 3] >> (position & 7) & 1 for position in self._positions(word))
+
+    def save(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.bit_count, self.hash_count, self.count))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Map a saved filter read-only"""
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, bit_count, hash_count, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            data.close()
+            raise ValueError(f"'{path}' is not a Bloom filter")
+        return cls(bit_count, hash_count, memoryview(data)[HEADER.size:], count)
+
+    def close(self):
+        """Unmap a loaded filter"""
+        if isinstance(self.bits, memoryview):
+            data = self.bits.obj
+            self.bits.release()
+            data.close()
+
+
+def build_bloom(words, path, error_rate=0.01):
+    """Build and save a filter for a word list"""
+    words = list(words)
+    bloom = BloomFilter.for_capacity(len(words), error_rate)
+    for word in words:
+        bloom.add(word)
+    bloom.save(path)
+    return bloom
+
+
+def exact_path(bloom_path):
+    """Return the exact index file that sits next to a filter file"""
+    return os.path.splitext(bloom_path)[0] + '.hgd'
+
+
+def build_lexicon(words, path, error_rate=0.01):
+    """
+    Build and save a filter plus its exact index.
+
+    Returns:
+        Lexicon: The saved lexicon, loaded back from disk
+    """
+    words = sorted({word.lower() for word in words})
+    build_bloom(words, path, error_rate)
+    compile_words(words, exact_path(path), sort=True)
+    return Lexicon.load(path)
+
+
+class Lexicon:
+    def __init__(self, bloom, exact=None):
+        """
+        Args:
+            bloom (BloomFilter): Filter over the lexicon
+            exact: Exact index with fast membership (a sorted
+                CompiledDictionary, a Dawg, a set); when omitted, filter
+                positives are trusted
+        """
+        self.bloom = bloom
+        self.exact = exact
+
+    @classmethod
+    def load(cls, path):
+        """Map a saved filter and, if build_lexicon wrote one, its exact index"""
+        bloom = BloomFilter.load(path)
+        exact = CompiledDictionary(exact_path(path)) if os.path.exists(exact_path(path)) else None
+        return cls(bloom, exact)
+
+    def __contains__(self, word):
+        word = word.lower()
+        if word not in self.bloom:
+            return False
+        return self.exact is None or word in self.exact
+
+    def close(self):
+        self.bloom.close()
+        if isinstance(self.exact, CompiledDictionary):
+            self.exact.close()
+
+
+if __name__ == "__main__":
+    from hangman_wordfile import WordFile
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python hangman_bloom.py <lexicon.txt> <output.bloom>")
+    with WordFile(sys.argv[1]) as source:
+        build_lexicon(source, sys.argv[2]).close()
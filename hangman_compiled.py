@@ -0,0 +1,212 @@
+"""
+Compiled binary dictionaries.
+
+compile_words() turns a word list (anything HangmanGame.load_words
+accepts, or its result) into a versioned artifact:
+
+    header   magic, version, flags, word count, bucket count, section
+             offsets, CRC32 of everything after the header
+    blob     UTF-8 words back to back, sorted by length in characters
+             (and alphabetically inside a length when flags has SORTED)
+    offsets  word_count + 1 little-endian uint64 offsets into the blob
+    buckets  (length, first word, word count) triples, uint32 each;
+             length counts characters, as len(word) does
+
+CompiledDictionary opens it with one mmap and a header read, so startup
+cost does not depend on the dictionary size, and every process mapping
+the same file shares its pages read-only. A SORTED dictionary answers
+`word in dictionary` by bisecting the word's length bucket.
+
+Usage:
+    python hangman_compiled.py words.txt words.hgd
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+MAGIC = b'HGDICT\r\n'
+VERSION = 2
+HEADER = struct.Struct('<8sHHIIQQQI')
+BUCKET = struct.Struct('<III')
+SORTED = 1
+
+
+def encode_words(words, sort=False):
+    """
+    Build a compiled dictionary image in memory.
+
+    Args:
+        words (iterable): Validated words, e.g. from HangmanGame.load_words
+        sort (bool): Also sort inside each length and set SORTED; word
+            ids then follow that order instead of the input order
+
+    Returns:
+        bytes: The artifact compile_words() would write
+    """
+    # Buckets are keyed by characters; UTF-8 byte lengths differ for non-ASCII
+    words = sorted(words, key=(lambda word: (len(word), word)) if sort else len)
+    if not words:
+        raise ValueError("File contains no valid words")
+
+    encoded = [word.encode('utf-8') for word in words]
+    offsets = array('Q', [0])
+    buckets = []
+    for word, data in zip(words, encoded):
+        offsets.append(offsets[-1] + len(data))
+        if buckets and buckets[-1][0] == len(word):
+            buckets[-1][2] += 1
+        else:
+            buckets.append([len(word), len(offsets) - 2, 1])
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    blob = b''.join(encoded)
+    # Keep the offsets table 8-byte aligned so it can be cast in place
+    padding = b'\0' * (-(HEADER.size + len(blob)) % 8)
+    body = b''.join([blob, padding, offsets.tobytes()] +
+                    [BUCKET.pack(*bucket) for bucket in buckets])
+    offsets_at = HEADER.size + len(blob) + len(padding)
+    buckets_at = offsets_at + len(offsets) * 8
+    header = HEADER.pack(MAGIC, VERSION, SORTED if sort else 0, len(encoded), len(buckets),
+                         offsets_at, buckets_at, 0, zlib.crc32(body))
+    return header + body
+
+
+def compile_words(words, path, sort=False):
+    """
+    Write a compiled dictionary.
+
+    Args:
+        words (iterable): Validated words, e.g. from HangmanGame.load_words
+        path (str): Output file; replaced atomically
+        sort (bool): See encode_words
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(encode_words(words, sort))
+    os.replace(tmp, path)
+
+
+def is_compiled(filename):
+    """Return True if filename starts with the compiled dictionary magic"""
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class CompiledDictionary(Sequence):
+    def __init__(self, filename, verify=False):
+        """
+        Open a compiled dictionary.
+
+        Args:
+            filename (str): Path written by compile_words
+            verify (bool): Check the CRC32 now instead of trusting the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a compatible dictionary
+        """
+        try:
+            with open(filename, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Word file '{filename}' not found")
+        except ValueError:
+            raise ValueError(f"'{filename}' is not a compiled dictionary")
+        self._attach(buffer, f"'{filename}'", verify)
+
+    @classmethod
+    def from_buffer(cls, buffer, verify=False):
+        """Use an image already in memory (e.g. shared memory) without copying it"""
+        dictionary = cls.__new__(cls)
+        dictionary._attach(memoryview(buffer).toreadonly(), "Buffer", verify)
+        return dictionary
+
+    def _attach(self, buffer, label, verify):
+        self._map = buffer
+        if len(self._map) < HEADER.size:
+            self._release()
+            raise ValueError(f"{label} is not a compiled dictionary")
+        (magic, version, self.flags, self._count, bucket_count, offsets_at,
+         buckets_at, _, self._checksum) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._release()
+            raise ValueError(f"{label} is not a version {VERSION} compiled dictionary")
+
+        view = memoryview(self._map)
+        if sys.byteorder == 'little':
+            self._offsets = view[offsets_at:buckets_at].cast('Q')
+        else:
+            self._offsets = array('Q', view[offsets_at:buckets_at])
+            self._offsets.byteswap()
+        self._buckets = {}
+        for i in range(bucket_count):
+            length, first, count = BUCKET.unpack_from(self._map, buckets_at + i * BUCKET.size)
+            self._buckets[length] = (first, count)
+        view.release()
+        if verify and not self.verify():
+            self.close()
+            raise ValueError(f"{label} failed its checksum")
+
+    def verify(self):
+        """Return True if the body matches the header checksum"""
+        return zlib.crc32(memoryview(self._map)[HEADER.size:]) == self._checksum
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        start = HEADER.size + self._offsets[index]
+        return bytes(self._map[start:HEADER.size + self._offsets[index + 1]]).decode('utf-8')
+
+    def __contains__(self, word):
+        if not self.flags & SORTED:
+            return super().__contains__(word)
+        bucket = self.bucket(len(word))
+        i = bisect_left(self, word, bucket.start, bucket.stop)
+        return i < bucket.stop and self[i] == word
+
+    def lengths(self):
+        return sorted(self._buckets)
+
+    def bucket(self, length):
+        """Return the index range of the words with the given length"""
+        first, count = self._buckets.get(length, (0, 0))
+        return range(first, first + count)
+
+    def _release(self):
+        if isinstance(self._map, memoryview):
+            self._map.release()
+        else:
+            self._map.close()
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    from hangman_wordfile import WordFile
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python hangman_compiled.py <words.txt> <output.hgd>")
+    with WordFile(sys.argv[1]) as source:
+        compile_words(source, sys.argv[2])
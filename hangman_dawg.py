@@ -0,0 +1,214 @@
+"""
+Compact DAWG dictionary.
+
+Dawg stores a word list as a minimal acyclic automaton (shared prefixes
+and suffixes) flattened into a few typed arrays, instead of one Python
+str per word. It is a read-only sequence in sorted order, so WordManager
+and random.choice use it like a list:
+
+    word_manager = WordManager(Dawg(HangmanGame.load_words("words.txt")))
+
+Membership is O(length), indexing walks per-node word counts, and
+match() enumerates the words consistent with a masked display.
+"""
+from array import array
+from collections.abc import Sequence
+
+from hangman_index import parse_pattern
+
+MAX_LENGTH_BIT = 63
+
+
+class _BuildNode:
+    __slots__ = ('edges', 'final', 'number')
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+        self.number = None
+
+
+class Dawg(Sequence):
+    def __init__(self, words):
+        """
+        Build the automaton (Daciuk et al. incremental construction).
+
+        Args:
+            words (iterable): Words to store; duplicates are dropped
+        """
+        root = _BuildNode()
+        register = {}
+        unchecked = []  # (parent, letter, child) along the last word's path
+        previous = ""
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = (child.final, tuple((c, node.number) for c, node in sorted(child.edges.items())))
+                if key in register:
+                    parent.edges[letter] = register[key]
+                else:
+                    child.number = len(register)
+                    register[key] = child
+
+        for word in sorted(set(words)):
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _BuildNode()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.final = True
+            previous = word
+        minimize(0)
+        self._flatten(root)
+
+    def _flatten(self, root):
+        order, numbering = [], {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if id(node) in numbering:
+                continue
+            numbering[id(node)] = len(order)
+            order.append(node)
+            stack.extend(node.edges.values())
+
+        self.edge_start = array('I', [0])
+        self.edge_label = array('I')
+        self.edge_target = array('I')
+        self.final = bytearray(len(order))
+        for i, node in enumerate(order):
+            self.final[i] = node.final
+            for letter, child in sorted(node.edges.items()):
+                self.edge_label.append(ord(letter))
+                self.edge_target.append(numbering[id(child)])
+            self.edge_start.append(len(self.edge_label))
+
+        # Word counts and reachable suffix lengths, children before parents
+        self.count = array('I', [0]) * len(order)
+        self.lengths = array('Q', [0]) * len(order)
+        done = bytearray(len(order))
+        stack = [0]
+        while stack:
+            node = stack[-1]
+            pending = [t for t in self._targets(node) if not done[t]]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if done[node]:
+                continue
+            count, lengths = self.final[node], self.final[node]
+            for target in self._targets(node):
+                count += self.count[target]
+                lengths |= self.lengths[target] << 1
+            self.count[node] = count
+            self.lengths[node] = (lengths & ((1 << MAX_LENGTH_BIT) - 1)) | \
+                ((lengths >> MAX_LENGTH_BIT != 0) << MAX_LENGTH_BIT)
+            done[node] = 1
+
+    def _targets(self, node):
+        return self.edge_target[self.edge_start[node]:self.edge_start[node + 1]]
+
+    def _child(self, node, letter):
+        label = ord(letter)
+        lo, hi = self.edge_start[node], self.edge_start[node + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.edge_label[mid] < label:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.edge_start[node + 1] and self.edge_label[lo] == label:
+            return self.edge_target[lo]
+        return None
+
+    def __contains__(self, word):
+        node = 0
+        for letter in word:
+            node = self._child(node, letter)
+            if node is None:
+                return False
+        return bool(self.final[node])
+
+    def __len__(self):
+        return self.count[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        node, letters = 0, []
+        while True:
+            if self.final[node]:
+                if index == 0:
+                    return ''.join(letters)
+                index -= 1
+            for edge in range(self.edge_start[node], self.edge_start[node + 1]):
+                target = self.edge_target[edge]
+                if index < self.count[target]:
+                    letters.append(chr(self.edge_label[edge]))
+                    node = target
+                    break
+                index -= self.count[target]
+
+    def match(self, pattern, wrong_letters=()):
+        """
+        Enumerate the words consistent with a masked display.
+
+        Args:
+            pattern (str or list): e.g. '_ y t h _ n' or parse_pattern() output
+            wrong_letters (iterable): Letters known not to be in the word
+
+        Returns:
+            list: Matching words in sorted order
+        """
+        slots = parse_pattern(pattern) if isinstance(pattern, str) else pattern
+        length = len(slots)
+        # Blanks can hold neither a wrong letter nor an already revealed one
+        banned = {ord(letter.lower()) for letter in wrong_letters}
+        banned.update(ord(letter) for letter in slots if letter is not None)
+        matches = []
+        stack = [(0, 0, "")]
+        while stack:
+            node, depth, prefix = stack.pop()
+            if depth == length:
+                if self.final[node]:
+                    matches.append(prefix)
+                continue
+            if not self.lengths[node] >> min(length - depth, MAX_LENGTH_BIT) & 1:
+                continue
+            slot = slots[depth]
+            if slot is not None:
+                child = self._child(node, slot)
+                if child is not None:
+                    stack.append((child, depth + 1, prefix + slot))
+                continue
+            for edge in range(self.edge_start[node + 1] - 1, self.edge_start[node] - 1, -1):
+                if self.edge_label[edge] not in banned:
+                    stack.append((self.edge_target[edge], depth + 1, prefix + chr(self.edge_label[edge])))
+        return matches
+
+    def words_with_prefix(self, prefix):
+        """Return the index range of the words starting with prefix"""
+        node, start = 0, 0
+        for letter in prefix:
+            if self.final[node]:
+                start += 1
+            child = self._child(node, letter)
+            if child is None:
+                return range(0)
+            for edge in range(self.edge_start[node], self.edge_start[node + 1]):
+                if self.edge_target[edge] == child and self.edge_label[edge] == ord(letter):
+                    break
+                start += self.count[self.edge_target[edge]]
+            node = child
+        return range(start, start + self.count[node])
@@ -0,0 +1,150 @@
+"""
+Per-word difficulty scores.
+
+A word's difficulty is the number of wrong guesses the solver makes
+before it has revealed the whole word (no try limit). Scores are computed
+in parallel and kept in a JSON file; update_scores() only scores words
+that are not in the file yet. Existing scores are kept as-is when words
+are added, although a larger dictionary can make some words harder.
+
+DifficultyIndex sorts the scores so WordManager.select_word can draw a
+word from a difficulty band with two bisections. It keeps the scores by
+word, so WordManager.use() reindexes it for a reloaded word list.
+
+Usage:
+    python hangman_difficulty.py words.txt scores.json
+"""
+import json
+import os
+import random
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from hangman_engine import HangmanEngine
+from hangman_solver import Solver
+
+CHUNK_SIZE = 2000
+
+_worker_solver = None
+
+
+def _init_worker(words, strategy):
+    global _worker_solver
+    _worker_solver = Solver(words, strategy)
+
+
+def score_word(solver, word):
+    """Return the solver's wrong-guess count for word"""
+    engine = HangmanEngine(max_tries=26)
+    engine.start(word)
+    solver.start(len(engine.word))
+    while not engine.is_won():
+        letter = solver.next_guess()
+        engine.guess(letter)
+        solver.observe(letter, engine.revealed_letters())
+    return engine.max_tries - engine.remaining_tries
+
+
+def _score_chunk(words):
+    return [score_word(_worker_solver, word) for word in words]
+
+
+def score_words(dictionary, words, strategy='entropy', processes=None):
+    """
+    Score words against a dictionary in parallel.
+
+    Args:
+        dictionary (list): Every word the solver considers
+        words (list): The words to score
+        strategy (str): Solver strategy
+        processes (int): Worker processes; None uses every core, 1 runs inline
+
+    Returns:
+        dict: {word: wrong guesses}
+    """
+    dictionary = [word.lower() for word in dictionary]
+    words = [word.lower() for word in words]
+    chunks = [words[i:i + CHUNK_SIZE] for i in range(0, len(words), CHUNK_SIZE)]
+    if processes == 1 or len(chunks) <= 1:
+        _init_worker(dictionary, strategy)
+        results = [_score_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                 initargs=(dictionary, strategy)) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+    return {word: score for chunk, scores in zip(chunks, results)
+            for word, score in zip(chunk, scores)}
+
+
+def load_scores(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['scores']
+
+
+def update_scores(words, path, strategy='entropy', processes=None):
+    """
+    Score the words missing from the scores file and save it.
+
+    Returns:
+        dict: {word: score} for every word in words
+    """
+    scores = load_scores(path)
+    missing = [word for word in dict.fromkeys(word.lower() for word in words)
+               if word not in scores]
+    if missing:
+        scores.update(score_words(words, missing, strategy, processes))
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'version': 1, 'scores': scores}, f)
+        os.replace(tmp, path)
+    return scores
+
+
+class DifficultyIndex:
+    def __init__(self, words, scores):
+        """
+        Sort the words of a word list by difficulty.
+
+        Args:
+            words (sequence): The word list WordManager selects from
+            scores (dict): {word: score}; unscored words are left out
+        """
+        self.word_scores = scores  # keyed by word, so a reload can reindex
+        pairs = sorted((scores[word.lower()], word_id) for word_id, word in enumerate(words)
+                       if word.lower() in scores)
+        self.scores = [score for score, _ in pairs]
+        self.word_ids = [word_id for _, word_id in pairs]
+
+    def reindex(self, words):
+        """Return an index with the same scores over a reloaded word list"""
+        return DifficultyIndex(words, self.word_scores)
+
+    def band(self, min_difficulty=None, max_difficulty=None):
+        """Return the (lo, hi) slice of the sorted index inside the band"""
+        lo = 0 if min_difficulty is None else bisect_left(self.scores, min_difficulty)
+        hi = len(self.scores) if max_difficulty is None else bisect_right(self.scores, max_difficulty)
+        return lo, hi
+
+    def select(self, min_difficulty=None, max_difficulty=None, rng=random):
+        """
+        Draw a word id uniformly from a difficulty band.
+
+        Raises:
+            ValueError: If no word falls inside the band
+        """
+        lo, hi = self.band(min_difficulty, max_difficulty)
+        if lo >= hi:
+            raise ValueError(f"No words with difficulty between {min_difficulty} and {max_difficulty}")
+        return self.word_ids[rng.randrange(lo, hi)]
+
+
+if __name__ == "__main__":
+    from hangman_wordfile import WordFile
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python hangman_difficulty.py <words.txt> <scores.json>")
+    with WordFile(sys.argv[1]) as source:
+        update_scores(list(source), sys.argv[2])
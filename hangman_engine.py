@@ -0,0 +1,227 @@
+from functools import lru_cache
+
+ORD_A = ord('a')
+LETTER_BITS = {chr(ORD_A + i): 1 << i for i in range(26)}
+
+
+def letter_bit(letter):
+    """Return the guessed-letter mask bit for a single lowercase letter"""
+    return 1 << (ord(letter) - ORD_A)
+
+
+def validate_letter(guess, guessed):
+    """
+    Check a letter guess against a guessed-letter mask.
+
+    Returns:
+        tuple: (bool, str) - (is_valid, error_message)
+    """
+    bit = LETTER_BITS.get(guess)
+    if bit is None:
+        if not guess.isalpha():
+            return False, "Please enter a letter."
+        if len(guess) != 1:
+            return False, "Please enter a single letter."
+        # Masks only cover a-z; 'İ'.lower() is not even one character
+        if not guess.isascii():
+            return False, "Please enter a letter from a to z."
+        bit = LETTER_BITS[guess.lower()]
+    if guessed & bit:
+        return False, "You already guessed that letter."
+    return True, ""
+
+
+def sorted_letters(mask):
+    """Expand a guessed-letter mask into its letters in alphabetical order"""
+    letters = []
+    while mask:
+        low = mask & -mask
+        letters.append(chr(low.bit_length() - 1 + ORD_A))
+        mask ^= low
+    return letters
+
+
+def letters_from_mask(mask):
+    """Expand a guessed-letter mask back into a set of letters"""
+    return set(sorted_letters(mask))
+
+
+@lru_cache(maxsize=65536)
+def compile_word(word):
+    """
+    Precompute the letter -> position bitmask table for a word.
+
+    Args:
+        word (str): The lowercase word to compile
+
+    Returns:
+        tuple: (dict, int, int) - (positions, full_mask, letters_mask)
+    """
+    positions = {}
+    letters_mask = 0
+    for i, letter in enumerate(word):
+        positions[letter] = positions.get(letter, 0) | (1 << i)
+        # Letters off a-z have positions but no mask bit
+        letters_mask |= LETTER_BITS.get(letter, 0)
+    return positions, (1 << len(word)) - 1, letters_mask
+
+
+class HangmanEngine:
+    """
+    Single source of truth for one hangman game.
+
+    The selected word is compiled once into a letter -> position bitmask
+    table, so a guess is one mask OR and the win check one integer
+    comparison. WordManager, GameState and GameLogic are views over it.
+    """
+
+    def __init__(self, max_tries=6):
+        self.max_tries = max_tries
+        self.word = ""
+        self.word_id = None
+        self.positions = {}
+        self.full_mask = 0
+        self.letters_mask = 0
+        self.revealed = 0
+        self.guessed = 0
+        self.guessed_words = set()
+        self.remaining_tries = max_tries
+        self.game_won = False
+        self.game_over = False
+        # Told about every start and guess, e.g. a hangman_eventlog.SessionRecorder
+        self.recorder = None
+
+    def start(self, word, max_tries=None, word_id=None):
+        """
+        Start a new game with the given word.
+
+        Args:
+            word (str): The word to be guessed
+            max_tries (int): Overrides the engine's max_tries when given
+            word_id (int): Index of the word in its word list, if known
+        """
+        self.load(word, max_tries, word_id)
+        if self.recorder is not None:
+            self.recorder.started(self)
+
+    def load(self, word, max_tries=None, word_id=None):
+        """Set up a game like start() without telling the recorder, to resume a saved game"""
+        if max_tries is not None:
+            self.max_tries = max_tries
+        self.word = word.lower()
+        self.word_id = word_id
+        self.positions, self.full_mask, self.letters_mask = compile_word(self.word)
+        self.revealed = 0
+        self.guessed = 0
+        self.guessed_words = set()
+        self.remaining_tries = self.max_tries
+        self.game_won = False
+        self.game_over = False
+
+    def validate_guess(self, guess):
+        """
+        Validate if the guess is acceptable.
+
+        Returns:
+            tuple: (bool, str) - (is_valid, error_message)
+        """
+        return validate_letter(guess, self.guessed)
+
+    def has_guessed(self, letter):
+        return bool(self.guessed & LETTER_BITS.get(letter, 0))
+
+    def reveal(self, letter):
+        """Reveal every position of a letter without counting it as a guess"""
+        self.revealed |= self.positions.get(letter, 0)
+
+    def guess(self, letter):
+        """
+        Record a guess and reveal its positions.
+
+        Args:
+            letter (str): A single lowercase letter; one off a-z still
+                reveals or costs a try but is not kept in the mask
+
+        Returns:
+            bool: True if the letter is in the word
+        """
+        try:
+            self.guessed |= LETTER_BITS[letter]
+        except KeyError:
+            pass
+        hit = self.positions.get(letter, 0)
+        if self.recorder is not None:
+            self.recorder.guessed(letter, hit != 0)
+        if hit:
+            self.revealed |= hit
+            return True
+        self.remaining_tries -= 1
+        return False
+
+    def guess_word(self, word):
+        """
+        Record a full-word guess; a wrong word costs one try.
+
+        Returns:
+            bool: True if it is the word
+        """
+        word = word.lower()
+        self.guessed_words.add(word)
+        if self.recorder is not None:
+            self.recorder.word_guessed(word == self.word)
+        if word == self.word:
+            self.revealed = self.full_mask
+            return True
+        self.remaining_tries -= 1
+        return False
+
+    def is_won(self):
+        return self.revealed == self.full_mask
+
+    def is_lost(self):
+        return self.remaining_tries <= 0
+
+    def is_over(self):
+        return self.revealed == self.full_mask or self.remaining_tries <= 0
+
+    def update_status(self):
+        """
+        Latch the game_won/game_over flags from the current masks.
+
+        Returns:
+            bool: True if the game is over
+        """
+        if self.revealed == self.full_mask:
+            self.game_won = True
+            self.game_over = True
+        elif self.remaining_tries <= 0:
+            self.game_over = True
+        return self.game_over
+
+    @property
+    def guessed_letters(self):
+        return letters_from_mask(self.guessed)
+
+    @guessed_letters.setter
+    def guessed_letters(self, letters):
+        self.guessed = 0
+        for letter in letters:
+            self.guessed |= LETTER_BITS.get(letter, 0)
+
+    def revealed_letters(self):
+        """Return the word as a list with '_' for hidden positions"""
+        revealed = self.revealed
+        return [char if revealed >> i & 1 else '_' for i, char in enumerate(self.word)]
+
+    def display_word(self):
+        return ' '.join(self.revealed_letters())
+
+    def game_state(self):
+        """Return the state dict served by GameLogic.get_game_state"""
+        return {
+            'word_state': self.display_word(),
+            'guessed_letters': sorted_letters(self.guessed),
+            'remaining_tries': self.remaining_tries,
+            'game_over': self.game_over,
+            'game_won': self.game_won
+        }
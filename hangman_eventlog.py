@@ -0,0 +1,382 @@
+"""
+Append-only event log of games.
+
+A SessionRecorder installed on a HangmanEngine appends one 16-byte record
+per game start, letter guess and word guess: session id (uint64), word
+id (uint32), event kind, argument (max tries, letter index or word-guess
+hit) and padding. GameLogic(log=...) installs one on its engine, so games
+started by WordManager.select_word and guesses made through GameState
+are logged too.
+Records go to numbered segment files in a directory and are made durable
+by group commit: appends only fill a buffer, which is written and
+fsynced once per commit_every records or commit_interval seconds.
+
+replay() reads every segment as one NumPy record array and rebuilds the
+latest game of every session with a few vectorized passes, so recovering
+a million sessions does not run a Python loop per event. compact()
+rewrites the sealed segments keeping only the events of unfinished
+games.
+
+Session ids are never reused, even after compaction has dropped every
+record of the newest sessions: EventLog reserves ids in blocks of
+SESSION_BLOCK and persists the end of the reserved range in
+sessions.next before handing any of them out.
+
+    log = EventLog("events", words)
+    game_logic = GameLogic(log=log)
+    ...
+    recovered = replay("events", words)
+    restore(game_logic, recovered.snapshot(session_id), words)
+"""
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from hangman_engine import LETTER_BITS, ORD_A
+from hangman_sessions import OVER, WON
+from hangman_snapshot import SNAPSHOT
+
+RECORD = struct.Struct('<QIBBxx')
+RECORD_DTYPE = np.dtype([('session', '<u8'), ('word_id', '<u4'), ('kind', 'u1'),
+                         ('arg', 'u1'), ('pad', 'V2')])
+START = 0
+GUESS = 1
+WORD_GUESS = 2
+SEGMENT_RECORDS = 1 << 20
+SESSION_BLOCK = 1024
+HIGH_WATER = struct.Struct('<Q')
+HIGH_WATER_FILE = 'sessions.next'
+
+
+def _segment_name(number):
+    return f"{number:08d}.log"
+
+
+def segments(path):
+    """Return the segment files of a log directory in write order"""
+    names = sorted(name for name in os.listdir(path) if name.endswith('.log'))
+    return [os.path.join(path, name) for name in names]
+
+
+def _read_records(files):
+    chunks = []
+    for file in files:
+        with open(file, 'rb') as f:
+            data = f.read()
+        # A crash can leave a torn record at the end of the last segment
+        usable = len(data) - len(data) % RECORD.size
+        chunks.append(np.frombuffer(data, dtype=RECORD_DTYPE, count=usable // RECORD.size))
+    if not chunks:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.concatenate(chunks)
+
+
+class EventLog:
+    def __init__(self, path, words, commit_every=1024, commit_interval=0.05,
+                 segment_records=SEGMENT_RECORDS):
+        """
+        Open (or create) a log directory for appending.
+
+        Args:
+            path (str): Directory holding the segment files
+            words (sequence): Word list the logged word ids refer to
+            commit_every (int): Records buffered before a write + fsync
+            commit_interval (float): Longest a record waits for its fsync
+            segment_records (int): Records per segment before rolling over
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.words = words
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.segment_records = segment_records
+        self._word_ids = None
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._pending = 0
+        self._first_pending = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+        files = segments(path)
+        sessions = _read_records(files)['session']
+        self._next_session = max(int(sessions.max()) + 1 if len(sessions) else 0,
+                                 self._read_high_water())
+        self._reserved = self._next_session
+        self._segment = int(os.path.basename(files[-1])[:-4]) if files else 0
+        self._segment_count = os.path.getsize(files[-1]) // RECORD.size if files else 0
+        self._fd = self._open_segment()
+        # Drop a torn tail so new records stay aligned
+        os.ftruncate(self._fd, self._segment_count * RECORD.size)
+
+    def _open_segment(self):
+        return os.open(os.path.join(self.path, _segment_name(self._segment)),
+                       os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _read_high_water(self):
+        try:
+            with open(os.path.join(self.path, HIGH_WATER_FILE), 'rb') as f:
+                return HIGH_WATER.unpack(f.read(HIGH_WATER.size))[0]
+        except (FileNotFoundError, struct.error):
+            return 0
+
+    def _reserve(self):
+        # Durable before any id of the block is used; a crash skips ids
+        self._reserved = self._next_session + SESSION_BLOCK
+        path = os.path.join(self.path, HIGH_WATER_FILE)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(HIGH_WATER.pack(self._reserved))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
+
+    def new_session(self):
+        """Allocate a session id"""
+        with self._lock:
+            if self._next_session >= self._reserved:
+                self._reserve()
+            session_id = self._next_session
+            self._next_session += 1
+            return session_id
+
+    def recorder(self, session_id=None):
+        """Return a SessionRecorder appending to this log"""
+        return SessionRecorder(self, session_id)
+
+    def word_id(self, word):
+        """Look up the id of a word that was started without one"""
+        if self._word_ids is None:
+            self._word_ids = {w.lower(): i for i, w in enumerate(self.words)}
+        return self._word_ids[word.lower()]
+
+    def start(self, session_id, word_id, max_tries):
+        self.append(session_id, START, max_tries, word_id)
+
+    def guess(self, session_id, letter):
+        self.append(session_id, GUESS, ord(letter) - ORD_A)
+
+    def word_guess(self, session_id, correct):
+        self.append(session_id, WORD_GUESS, int(correct))
+
+    def append(self, session_id, kind, arg, word_id=0):
+        """Buffer one record; it is durable after the next commit"""
+        with self._lock:
+            if not self._pending:
+                self._first_pending = time.monotonic()
+            self._buffer += RECORD.pack(session_id, word_id, kind, arg)
+            self._pending += 1
+            if (self._pending >= self.commit_every
+                    or self._segment_count + self._pending >= self.segment_records
+                    or time.monotonic() - self._first_pending >= self.commit_interval):
+                self._commit()
+
+    def _commit(self):
+        if not self._pending:
+            return
+        os.write(self._fd, self._buffer)
+        os.fsync(self._fd)
+        self._segment_count += self._pending
+        self._buffer.clear()
+        self._pending = 0
+        if self._segment_count >= self.segment_records:
+            os.close(self._fd)
+            self._segment += 1
+            self._segment_count = 0
+            self._fd = self._open_segment()
+
+    def commit(self):
+        """Write and fsync every buffered record"""
+        with self._lock:
+            self._commit()
+
+    def _run(self):
+        while not self._stop.wait(self.commit_interval):
+            self.commit()
+
+    def start_committer(self):
+        """Commit in a daemon thread so an idle log still meets commit_interval"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def compact(self):
+        """Rewrite the sealed segments, keeping only unfinished games"""
+        with self._lock:
+            self._commit()
+            sealed = segments(self.path)[:-1]
+        if sealed:
+            compact(self.path, self.words, sealed)
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.commit()
+        os.close(self._fd)
+
+
+class SessionRecorder:
+    def __init__(self, log, session_id=None):
+        """
+        Log the games of one engine under one session.
+
+        Args:
+            log (EventLog): Log to append to
+            session_id (int): Session to log under; allocated from the log
+                on the first start if omitted
+        """
+        self.log = log
+        self.session_id = session_id
+
+    def started(self, engine):
+        if self.session_id is None:
+            self.session_id = self.log.new_session()
+        word_id = engine.word_id
+        if word_id is None:
+            word_id = self.log.word_id(engine.word)
+        self.log.start(self.session_id, word_id, engine.max_tries)
+
+    def guessed(self, letter, hit):
+        if self.session_id is None:
+            raise ValueError("No game was started on this engine")
+        if letter in LETTER_BITS:
+            self.log.guess(self.session_id, letter)
+        elif not hit:
+            # Off a-z: nothing enters the mask, the miss only costs a try
+            # like a wrong word guess
+            self.log.word_guess(self.session_id, False)
+
+    def word_guessed(self, correct):
+        if self.session_id is None:
+            raise ValueError("No game was started on this engine")
+        self.log.word_guess(self.session_id, correct)
+
+
+class Recovered:
+    """Latest game of every session, as parallel arrays sorted by session id"""
+
+    def __init__(self, session_ids, word_ids, max_tries, guessed, remaining_tries, flags):
+        self.session_ids = session_ids
+        self.word_ids = word_ids
+        self.max_tries = max_tries
+        self.guessed = guessed
+        self.remaining_tries = remaining_tries
+        self.flags = flags
+
+    def __len__(self):
+        return len(self.session_ids)
+
+    def _row(self, session_id):
+        row = np.searchsorted(self.session_ids, session_id)
+        if row == len(self.session_ids) or self.session_ids[row] != session_id:
+            raise KeyError(f"Unknown session: {session_id}")
+        return row
+
+    def snapshot(self, session_id):
+        """Return the session's game as a hangman_snapshot snapshot"""
+        row = self._row(session_id)
+        return SNAPSHOT.pack(int(self.word_ids[row]), int(self.guessed[row]),
+                             int(self.remaining_tries[row]), int(self.flags[row]))
+
+    def unfinished(self):
+        """Return the ids of the sessions whose game is not over"""
+        return self.session_ids[(self.flags & OVER) == 0]
+
+
+def _letter_masks(words, word_ids):
+    """a-z mask of the letters of each word; bit 26 stands for any other letter"""
+    unique, inverse = np.unique(word_ids, return_inverse=True)
+    masks = np.zeros(len(unique), dtype=np.int64)
+    for i, word_id in enumerate(unique.tolist()):
+        for letter in set(words[word_id].lower()):
+            bit = ord(letter) - ORD_A
+            # Such letters cannot be guessed, so only a word guess wins
+            masks[i] |= 1 << bit if 0 <= bit < 26 else 1 << 26
+    return masks[inverse.reshape(-1)]
+
+
+def _latest_games(records, words):
+    """Return (Recovered, keep) where keep marks the records of each session's latest game"""
+    starts = np.flatnonzero(records['kind'] == START)
+    # Last start per session: unique over the reversed start positions
+    session_ids, first = np.unique(records['session'][starts][::-1], return_index=True)
+    last_start = starts[::-1][first]
+    row = np.searchsorted(session_ids, records['session'])
+    row = np.minimum(row, max(len(session_ids) - 1, 0))
+    keep = np.zeros(len(records), dtype=bool)
+    if len(session_ids):
+        keep = (session_ids[row] == records['session']) & (np.arange(len(records)) >= last_start[row])
+
+    word_ids = records['word_id'][last_start].astype(np.int64)
+    max_tries = records['arg'][last_start].astype(np.int16)
+    letters = _letter_masks(words, word_ids)
+
+    guesses = keep & (records['kind'] == GUESS)
+    guess_rows = row[guesses]
+    bits = np.left_shift(1, records['arg'][guesses].astype(np.int64))
+    guessed = np.zeros(len(session_ids), dtype=np.int64)
+    np.bitwise_or.at(guessed, guess_rows, bits)
+    misses = np.bincount(guess_rows[(letters[guess_rows] & bits) == 0], minlength=len(session_ids))
+
+    word_guesses = keep & (records['kind'] == WORD_GUESS)
+    hit = records['arg'][word_guesses] != 0
+    misses += np.bincount(row[word_guesses][~hit], minlength=len(session_ids))
+    won = (guessed & letters) == letters
+    won[row[word_guesses][hit]] = True
+
+    remaining_tries = max_tries - misses.astype(np.int16)
+    flags = np.where(won, WON | OVER, np.where(remaining_tries <= 0, OVER, 0)).astype(np.uint8)
+    return Recovered(session_ids, word_ids, max_tries, guessed, remaining_tries, flags), keep
+
+
+def replay(path, words):
+    """
+    Rebuild the latest game of every session from a log directory.
+
+    Args:
+        path (str): Log directory
+        words (sequence): Word list the logged word ids refer to; only
+            the words of logged games are read
+
+    Returns:
+        Recovered: Per-session state; sessions with no start are skipped
+    """
+    return _latest_games(_read_records(segments(path)), words)[0]
+
+
+def compact(path, words, files=None):
+    """
+    Drop the events of finished and superseded games from segments.
+
+    Args:
+        path (str): Log directory
+        words (sequence): Word list the logged word ids refer to
+        files (list): Segments to rewrite; all of them when omitted (only
+            safe while no EventLog is appending)
+    """
+    all_files = segments(path)
+    files = all_files if files is None else files
+    counts = [os.path.getsize(file) // RECORD.size for file in all_files]
+    records = _read_records(all_files)
+    recovered, keep = _latest_games(records, words)
+    session_row = np.searchsorted(recovered.session_ids, records['session'])
+    session_row = np.minimum(session_row, max(len(recovered) - 1, 0))
+    if len(recovered):
+        keep &= (recovered.flags[session_row] & OVER) == 0
+
+    start = 0
+    for file, count in zip(all_files, counts):
+        if file in files:
+            kept = records[start:start + count][keep[start:start + count]]
+            if len(kept):
+                tmp = f"{file}.tmp"
+                with open(tmp, 'wb') as f:
+                    f.write(kept.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, file)
+            else:
+                os.remove(file)
+        start += count
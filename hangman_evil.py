@@ -0,0 +1,78 @@
+"""
+Adversarial ("evil") hangman.
+
+EvilEngine is a drop-in HangmanEngine whose word is not fixed when the
+game starts: start() only fixes the length, and every guess keeps the
+largest family of remaining words that share the same reveal pattern for
+that letter. Families are found by splitting the candidate bitset with
+the (position, letter) bitsets of a WordIndex, so no per-word strings are
+built and the cost grows with the number of families, not words.
+
+Use it through the unchanged GameLogic interface:
+
+    game_logic = GameLogic(engine=EvilEngine(words))
+    game_logic.start_new_game("any word of the wanted length")
+"""
+from hangman_engine import HangmanEngine, compile_word, letter_bit
+from hangman_solver import Solver
+
+
+class EvilEngine(HangmanEngine):
+    def __init__(self, words, max_tries=6):
+        """
+        Args:
+            words (WordIndex or list): Dictionary the word may come from
+            max_tries (int): Wrong guesses allowed
+        """
+        super().__init__(max_tries)
+        self._solver = Solver(words)
+
+    def start(self, word, max_tries=None, word_id=None):
+        """Start a game on every dictionary word with the length of word"""
+        super().start(word, max_tries)
+        self._solver.start(len(self.word))
+        if not self._solver.candidates:
+            raise ValueError(f"No dictionary words of length {len(self.word)}")
+        self._settle(self._solver.candidates)
+
+    def _settle(self, candidates):
+        # Any member of the family can stand in for the word: they all
+        # agree on the revealed positions
+        self._solver.candidates = candidates
+        first = (candidates & -candidates).bit_length() - 1
+        self.word = self._solver.index.buckets[len(self.word)][first]
+        self.positions, self.full_mask, self.letters_mask = compile_word(self.word)
+
+    def guess(self, letter):
+        """
+        Record a guess, keeping the largest family of candidates.
+
+        Returns:
+            bool: True if the kept family reveals the letter
+        """
+        self.guessed |= letter_bit(letter)
+        families = self._solver.partition(letter)
+        # Largest family wins; on a tie prefer the one that hides the letter
+        positions, family = max(families, key=lambda item: (item[1].bit_count(), not item[0]))
+        self._settle(family)
+        if not positions:
+            self.remaining_tries -= 1
+            return False
+        for i in positions:
+            self.revealed |= 1 << i
+        return True
+
+    def guess_word(self, word):
+        """
+        Record a full-word guess; it is only right if the family has
+        narrowed down to that one word, otherwise the word is dropped.
+
+        Returns:
+            bool: True if it is the word
+        """
+        slot = self._solver.index.slots.get(word.lower())
+        bit = 1 << slot if slot is not None and len(word) == len(self.word) else 0
+        candidates = self._solver.candidates
+        if candidates & bit and candidates != bit:
+            self._settle(candidates & ~bit)
+        return super().guess_word(word)
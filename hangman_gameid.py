@@ -0,0 +1,79 @@
+"""
+Stateless, seekable game ids.
+
+A game id is fed through a counter-based generator (splitmix64 keyed
+with a deployment key), so every node maps the same id to the same word
+and parameters without sharing any state. Together with the log of
+guesses, replay() rebuilds the session on any worker, which lets servers
+scale out and fail over without a shared session database.
+
+Set HANGMAN_GAME_KEY to the same integer on every node of a deployment.
+"""
+import os
+
+from hangman_engine import HangmanEngine
+from hangman_shuffle import MASK64, mix64
+
+GAME_KEY = int(os.environ.get("HANGMAN_GAME_KEY", "0"))
+
+# Independent streams drawn from one game id
+WORD_STREAM = 0
+TRIES_STREAM = 1
+
+
+def game_random(game_id, stream=WORD_STREAM, key=None):
+    """Return the 64-bit random value for (game id, stream)"""
+    key = GAME_KEY if key is None else key
+    return mix64(mix64((game_id ^ mix64(key)) & MASK64) + stream & MASK64)
+
+
+def game_word_id(game_id, word_count, key=None):
+    """Map a game id to a word index, the same on every node"""
+    # Multiply-shift keeps the mapping unbiased enough without a modulo
+    return game_random(game_id, WORD_STREAM, key) * word_count >> 64
+
+
+def game_parameters(game_id, word_count, tries_range=(6, 6), key=None):
+    """
+    Derive every parameter of a game from its id.
+
+    Args:
+        game_id (int): Game id (any non-negative integer)
+        word_count (int): Length of the shared word list
+        tries_range (tuple): Inclusive (min, max) for max_tries
+
+    Returns:
+        dict: word_id and max_tries
+    """
+    low, high = tries_range
+    spread = high - low + 1
+    return {
+        'word_id': game_word_id(game_id, word_count, key),
+        'max_tries': low + (game_random(game_id, TRIES_STREAM, key) * spread >> 64)
+    }
+
+
+def replay(game_id, guesses, words, game=None, tries_range=(6, 6), key=None):
+    """
+    Rebuild a session from its id and guess log.
+
+    Args:
+        game_id (int): The game's id
+        guesses (iterable): Guessed letters in order
+        words (sequence): The shared word list
+        game: HangmanEngine or a view over one (e.g. GameLogic) to
+            restore into; a new engine is created when omitted
+
+    Returns:
+        HangmanEngine: The engine, in the state after the last guess
+    """
+    engine = HangmanEngine() if game is None else getattr(game, 'engine', game)
+    params = game_parameters(game_id, len(words), tries_range, key)
+    engine.start(words[params['word_id']], max_tries=params['max_tries'], word_id=params['word_id'])
+    for letter in guesses:
+        is_valid, error_message = engine.validate_guess(letter)
+        if not is_valid:
+            raise ValueError(f"Invalid guess {letter!r} in log: {error_message}")
+        engine.guess(letter.lower())
+        engine.update_status()
+    return engine
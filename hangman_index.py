@@ -0,0 +1,177 @@
+"""
+Pattern index over a word list.
+
+Words are bucketed by length. Within a bucket every (position, letter)
+pair maps to a bitset (a Python int) of the words that have that letter
+at that position, so a masked display such as "_ y t h _ n" plus a set of
+wrong letters resolves to a handful of big-int ANDs instead of a scan.
+
+Buckets are append-only; removed words are only cleared from the
+bitsets and the bucket's live mask. That lets copy() share the buckets,
+so a copy can be updated word by word while readers keep the original.
+"""
+
+
+def bit_indices(mask):
+    """Return the indices of the set bits in mask, lowest first"""
+    bits = bin(mask)[:1:-1]
+    indices = []
+    i = bits.find('1')
+    while i != -1:
+        indices.append(i)
+        i = bits.find('1', i + 1)
+    return indices
+
+
+def parse_pattern(pattern):
+    """Turn a display like '_ y t h _ n' or '_yth_n' into a list of letters/None"""
+    return [None if char == '_' else char.lower() for char in pattern.replace(' ', '')]
+
+
+def _mask(bits):
+    """Build a bitset int from bit positions in one pass"""
+    buffer = bytearray((max(bits) >> 3) + 1)
+    for bit in bits:
+        buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class WordIndex:
+    def __init__(self, words):
+        """
+        Build the index.
+
+        Args:
+            words (list): Word list, e.g. from HangmanGame.load_words;
+                repeated words are indexed once
+        """
+        self.buckets = {}
+        self.live = {}
+        self.slots = {}
+        self.position_letter = {}
+        self.letter_present = {}
+        for word in words:
+            word = word.lower()
+            if word not in self.slots:
+                bucket = self.buckets.setdefault(len(word), [])
+                self.slots[word] = len(bucket)
+                bucket.append(word)
+        for length, bucket in self.buckets.items():
+            self._index_bucket(length, bucket)
+
+    def _index_bucket(self, length, bucket):
+        # One column string per position; str.translate marks a letter's
+        # rows as '1' in C, and int(..., 2) turns that into the bitset.
+        self.live[length] = (1 << len(bucket)) - 1
+        for i in range(length):
+            column = ''.join([word[i] for word in bucket])
+            zeros = {ord(letter): '0' for letter in set(column)}
+            for letter in set(column):
+                bits = int(column.translate({**zeros, ord(letter): '1'})[::-1], 2)
+                self.position_letter[(length, i, letter)] = bits
+                key = (length, letter)
+                self.letter_present[key] = self.letter_present.get(key, 0) | bits
+
+    def update(self, inserted=(), deleted=()):
+        """
+        Apply many inserts and deletes at once.
+
+        Bit positions are collected per bitset first, so every touched
+        bitset is rebuilt once per call rather than once per word.
+
+        Args:
+            inserted (iterable): Lowercase words to append to their buckets
+            deleted (iterable): Lowercase words to clear; their bucket slots
+                are left in place
+        """
+        tables = (self.live, self.position_letter, self.letter_present)
+        changes = ({}, {})  # (bits to clear, bits to set) per (table number, key)
+        for clear, words in ((True, deleted), (False, inserted)):
+            pending = changes[0 if clear else 1]
+            for word in words:
+                length = len(word)
+                if clear:
+                    slot = self.slots.pop(word, None)
+                    if slot is None:
+                        continue
+                elif word in self.slots:
+                    continue
+                else:
+                    bucket = self.buckets.setdefault(length, [])
+                    slot = self.slots[word] = len(bucket)
+                    bucket.append(word)
+                pending.setdefault((0, length), []).append(slot)
+                for i, letter in enumerate(word):
+                    pending.setdefault((1, (length, i, letter)), []).append(slot)
+                for letter in set(word):
+                    pending.setdefault((2, (length, letter)), []).append(slot)
+        for (table, key), bits in changes[0].items():
+            tables[table][key] &= ~_mask(bits)
+        for (table, key), bits in changes[1].items():
+            tables[table][key] = tables[table].get(key, 0) | _mask(bits)
+
+    def add(self, word):
+        """Append a word to its length bucket and update the bitsets"""
+        self.update(inserted=(word,))
+
+    def remove(self, word):
+        """Clear a word from the bitsets; its bucket slot is left in place"""
+        self.update(deleted=(word,))
+
+    def copy(self):
+        """Return an index that can be changed without affecting this one"""
+        index = WordIndex.__new__(WordIndex)
+        # Buckets are append-only and slots is only read by the writer
+        index.buckets = self.buckets
+        index.slots = self.slots
+        index.live = dict(self.live)
+        index.position_letter = dict(self.position_letter)
+        index.letter_present = dict(self.letter_present)
+        return index
+
+    def __len__(self):
+        return sum(mask.bit_count() for mask in self.live.values())
+
+    def query_mask(self, pattern, wrong_letters=()):
+        """
+        Resolve a masked display to a bitset over its length bucket.
+
+        Args:
+            pattern (str or list): Display string or parse_pattern() output
+            wrong_letters (iterable): Letters known not to be in the word
+
+        Returns:
+            tuple: (int, int) - (length, candidate bitset)
+        """
+        slots = parse_pattern(pattern) if isinstance(pattern, str) else pattern
+        length = len(slots)
+        mask = self.live.get(length, 0)
+        if not mask:
+            return length, 0
+        position_letter = self.position_letter
+        revealed = set()
+        for i, letter in enumerate(slots):
+            if letter is not None:
+                revealed.add(letter)
+                mask &= position_letter.get((length, i, letter), 0)
+                if not mask:
+                    return length, 0
+        for letter in wrong_letters:
+            mask &= ~self.letter_present.get((length, letter.lower()), 0)
+        # A revealed letter is revealed everywhere, so no blank may hold it
+        for letter in revealed:
+            for i, slot in enumerate(slots):
+                if slot is None:
+                    mask &= ~position_letter.get((length, i, letter), 0)
+        return length, mask
+
+    def words_for_mask(self, length, mask):
+        bucket = self.buckets.get(length, [])
+        return [bucket[i] for i in bit_indices(mask)]
+
+    def query(self, pattern, wrong_letters=()):
+        """Return every word consistent with the display and the wrong letters"""
+        return self.words_for_mask(*self.query_mask(pattern, wrong_letters))
+
+    def count(self, pattern, wrong_letters=()):
+        return self.query_mask(pattern, wrong_letters)[1].bit_count()
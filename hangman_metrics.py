@@ -0,0 +1,197 @@
+"""
+Opt-in instrumentation for the game loop.
+
+Phase timings (input wait, validation, guess processing, status update,
+rendering, word selection) go into log2-bucketed histograms and events
+(guesses, wins, losses, invalid inputs) into counters. Every thread
+writes only to its own store, so recording takes no lock; stores are
+merged when dumped as Prometheus text or JSON.
+
+Nothing is recorded until enable() is called. instrument() wraps class
+methods at that point, so disabled runs pay no per-call cost.
+
+Environment switches used by 5_Ade_full_Game.py:
+    HANGMAN_METRICS=path.json|path.prom   record and dump on exit
+    HANGMAN_PROFILE=path.prof             run main() under cProfile
+"""
+import cProfile
+import functools
+import json
+import threading
+import time
+
+BUCKETS = 40  # upper bounds 2**0 .. 2**39 ns (about 9 minutes)
+OVERFLOW = BUCKETS  # index of the +Inf bucket, for anything longer
+SUM = BUCKETS + 1  # index of the running sum of durations
+
+enabled = False
+_local = threading.local()
+_stores = []
+_stores_lock = threading.Lock()
+
+
+class _ThreadStore:
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+
+
+def _store():
+    store = getattr(_local, 'store', None)
+    if store is None:
+        store = _local.store = _ThreadStore()
+        with _stores_lock:
+            _stores.append(store)
+    return store
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def observe(phase, ns):
+    """Record one duration in nanoseconds for a phase"""
+    histograms = _store().histograms
+    histogram = histograms.get(phase)
+    if histogram is None:
+        histogram = histograms[phase] = [0] * (SUM + 1)  # buckets, +Inf, sum
+    histogram[min(ns.bit_length(), OVERFLOW)] += 1
+    histogram[SUM] += ns
+
+
+def count(name, amount=1):
+    if enabled:
+        counters = _store().counters
+        counters[name] = counters.get(name, 0) + amount
+
+
+class _Timer:
+    __slots__ = ('phase', 'start')
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info):
+        observe(self.phase, time.perf_counter_ns() - self.start)
+
+
+class _NullTimer:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(phase):
+    """Context manager timing a phase; a no-op while disabled"""
+    return _Timer(phase) if enabled else _NULL_TIMER
+
+
+def instrument(cls, phases):
+    """
+    Wrap methods of cls so each call is timed under a phase.
+
+    Args:
+        cls (type): Class to patch in place
+        phases (dict): {method_name: phase}
+    """
+    for name, phase in phases.items():
+        method = getattr(cls, name)
+
+        @functools.wraps(method)
+        def timed(*args, _method=method, _phase=phase, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                observe(_phase, time.perf_counter_ns() - start)
+
+        setattr(cls, name, timed)
+
+
+def snapshot():
+    """Merge every thread's store into {'histograms': ..., 'counters': ...}"""
+    histograms, counters = {}, {}
+    with _stores_lock:
+        stores = list(_stores)
+    for store in stores:
+        for phase, histogram in list(store.histograms.items()):
+            merged = histograms.setdefault(phase, [0] * (SUM + 1))
+            for i, value in enumerate(histogram):
+                merged[i] += value
+        for name, value in list(store.counters.items()):
+            counters[name] = counters.get(name, 0) + value
+    return {'histograms': histograms, 'counters': counters}
+
+
+def to_json():
+    data = snapshot()
+    phases = {}
+    for phase, histogram in data['histograms'].items():
+        buckets = {str(1 << i): n for i, n in enumerate(histogram[:BUCKETS]) if n}
+        if histogram[OVERFLOW]:
+            buckets['+Inf'] = histogram[OVERFLOW]
+        phases[phase] = {
+            'count': sum(histogram[:SUM]),
+            'sum_ns': histogram[SUM],
+            'buckets_le_ns': buckets
+        }
+    return json.dumps({'phases': phases, 'counters': data['counters']}, indent=2, sort_keys=True)
+
+
+def to_prometheus():
+    data = snapshot()
+    lines = ["# TYPE hangman_phase_seconds histogram"]
+    for phase, histogram in sorted(data['histograms'].items()):
+        cumulative = 0
+        for i in range(BUCKETS):
+            cumulative += histogram[i]
+            lines.append(f'hangman_phase_seconds_bucket{{phase="{phase}",le="{(1 << i) / 1e9:g}"}} {cumulative}')
+        cumulative += histogram[OVERFLOW]
+        lines.append(f'hangman_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {cumulative}')
+        lines.append(f'hangman_phase_seconds_sum{{phase="{phase}"}} {histogram[SUM] / 1e9:g}')
+        lines.append(f'hangman_phase_seconds_count{{phase="{phase}"}} {cumulative}')
+    lines.append("# TYPE hangman_events_total counter")
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f'hangman_events_total{{event="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    """Write the metrics to path, as Prometheus text for .prom files else JSON"""
+    with open(path, 'w') as f:
+        f.write(to_prometheus() if path.endswith('.prom') else to_json())
+
+
+def profiled(func, path, every=1):
+    """
+    Wrap an entry point so every Nth call runs under cProfile.
+
+    Args:
+        func (callable): Entry point to wrap
+        path (str): Where to write pstats output (overwritten by each sample)
+        every (int): Profile one call out of every this many
+    """
+    calls = 0
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if (calls - 1) % every:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            profiler.dump_stats(path)
+
+    return wrapper
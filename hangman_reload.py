@@ -0,0 +1,165 @@
+"""
+Hot reload of the word file.
+
+DictionaryWatcher polls a word file and, when it changes, diffs the old
+and new word sets and applies only the inserted and deleted words to the
+derived indexes: the word list (swap-remove plus append), the WordIndex
+pattern bitsets and length buckets, and the AliasTable weights. Each
+reload builds a new DictionaryVersion and publishes it by replacing
+watcher.current in one assignment; older versions are never modified, so
+a game that read its version at the start keeps playing against it. The
+word list holds every word of the file once, lowercased.
+
+    watcher = DictionaryWatcher("words.txt")
+    watcher.subscribe(lambda version: word_manager.use(version))
+    ...
+    watcher.check()  # e.g. between games; or watcher.start() for a thread
+"""
+import os
+import threading
+
+from hangman_index import WordIndex
+from hangman_weights import AliasTable, load_weights, weights_path
+from hangman_wordfile import WordFile
+
+
+class DictionaryVersion:
+    __slots__ = ('number', 'words', 'index', 'weights')
+
+    def __init__(self, number, words, index, weights=None):
+        """
+        Args:
+            number (int): Increases by one per published reload
+            words (list): Word list; word ids index into it
+            index (WordIndex): Pattern index over words
+            weights (AliasTable): Optional weights aligned with words
+        """
+        self.number = number
+        self.words = words
+        self.index = index
+        self.weights = weights
+
+
+def _read_words(path):
+    # One entry per word: repeated lines (in any case) would leave a second
+    # list copy that the position map and the index could not track
+    with WordFile(path) as source:
+        return list(dict.fromkeys(word.lower() for word in source))
+
+
+class DictionaryWatcher:
+    def __init__(self, path, interval=1.0, weighted=None):
+        """
+        Load the word file and build the first version.
+
+        Args:
+            path (str): Word file to watch
+            interval (float): Seconds between polls when running as a thread
+            weighted (bool): Keep an AliasTable; defaults to whether a
+                weights file exists next to the word file
+        """
+        self.path = path
+        self.interval = interval
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._stamp = self._file_stamp()
+        words = _read_words(path)
+        if weighted is None:
+            weighted = os.path.exists(weights_path(path))
+        weights = AliasTable(self._weights_for(words)) if weighted else None
+        # Writer-side bookkeeping: list position of every word, never shared
+        self._positions = {word: i for i, word in enumerate(words)}
+        self.current = DictionaryVersion(0, words, WordIndex(words), weights)
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _weights_for(self, words):
+        path = weights_path(self.path)
+        if not os.path.exists(path):
+            return [1.0] * len(words)
+        return load_weights(words, path)
+
+    def subscribe(self, callback):
+        """Call callback(version) after every published reload"""
+        self._subscribers.append(callback)
+
+    def check(self):
+        """
+        Reload if the file changed since the last check.
+
+        Returns:
+            DictionaryVersion: The new version, or None if nothing changed
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        words = _read_words(self.path)
+        old = self.current
+        new_words = set(words)
+        deleted = [word for word in self._positions if word not in new_words]
+        inserted = [word for word in words if word not in self._positions]
+        if not deleted and not inserted:
+            return None
+        version = self._apply(old, inserted, deleted)
+        self.current = version
+        for callback in self._subscribers:
+            callback(version)
+        return version
+
+    def _apply(self, old, inserted, deleted):
+        # The list copy is one C-level memcpy; everything else is per change
+        words = list(old.words)
+        index = old.index.copy()
+        index.update(inserted=inserted, deleted=deleted)
+        weights = old.weights.copy() if old.weights is not None else None
+        positions = self._positions
+        changes = {}
+        for word in deleted:
+            i = positions.pop(word)
+            last = words.pop()
+            if i < len(words):
+                words[i] = last
+                positions[last] = i
+                if weights is not None:
+                    changes[i] = changes.pop(len(words), weights.weights[len(words)])
+            # The freed tail slot keeps weight 0 until an insert reuses it
+            changes[len(words)] = 0.0
+        appended = []
+        new_weights = self._weights_for(inserted) if weights is not None else ()
+        for n, word in enumerate(inserted):
+            positions[word] = len(words)
+            words.append(word)
+            if weights is None:
+                continue
+            if len(words) <= len(weights.weights):
+                changes[len(words) - 1] = new_weights[n]
+            else:
+                appended.append(new_weights[n])
+        if weights is not None:
+            if changes:
+                weights.update(changes)
+            if appended:
+                weights.extend(appended)
+        return DictionaryVersion(old.number + 1, words, index, weights)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except (OSError, ValueError):
+                # Mid-write or briefly missing file; keep serving the old version
+                continue
+
+    def start(self):
+        """Poll in a daemon thread"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,178 @@
+"""
+asyncio hangman server.
+
+Every TCP connection owns one game session played through GameLogic, so
+the server applies exactly the rules and messages of the console game.
+Requests and responses are one JSON object per line:
+
+    {"cmd": "new"}                   -> {"ok": true, "state": {...}}
+    {"cmd": "guess", "letter": "e"}  -> {"ok": true, "correct": true,
+                                         "message": "...", "game_over": false,
+                                         "status": "..."}
+    {"cmd": "state"}                 -> {"ok": true, "state": {...}}
+
+"state" is exactly what GameLogic.get_game_state returns. Errors come
+back as {"ok": false, "error": "..."}, including for lines longer than
+the stream limit (64 KiB), which are discarded.
+
+Usage:
+    python hangman_server.py serve [--port 5050] [--words words.txt]
+    python hangman_server.py load [--port 5050] [--connections 500] [--games 20]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from hangman_utils import load_game_module
+
+DEFAULT_WORDS = ["challenge", "galaxy", "adventure", "puzzle", "mystery",
+                 "fantasy", "treasure", "enchanted", "python", "journey",
+                 "victory", "champion", "knowledge", "discovery", "imagination"]
+
+game = load_game_module()
+
+
+class GameSession:
+    """Handles the protocol commands for one connection"""
+
+    def __init__(self, words):
+        self.words = words
+        self.game_logic = game.GameLogic()
+
+    def handle(self, request):
+        cmd = request.get('cmd')
+        if cmd == 'new':
+            self.game_logic.start_new_game(random.choice(self.words))
+            return {'ok': True, 'state': self.game_logic.get_game_state()}
+        if not self.game_logic.word:
+            return {'ok': False, 'error': "No game in progress, send 'new' first."}
+        if cmd == 'state':
+            return {'ok': True, 'state': self.game_logic.get_game_state()}
+        if cmd == 'guess':
+            return self.guess(str(request.get('letter', '')))
+        return {'ok': False, 'error': f"Unknown command: {cmd!r}"}
+
+    def guess(self, letter):
+        game_logic = self.game_logic
+        if game_logic.game_over:
+            return {'ok': False, 'error': "The game is over, send 'new' to play again."}
+        is_valid, error_message = game_logic.validate_guess(letter)
+        if not is_valid:
+            return {'ok': False, 'error': error_message}
+        correct, message = game_logic.make_guess(letter)
+        game_over, status = game_logic.update_game_status()
+        return {'ok': True, 'correct': correct, 'message': message,
+                'game_over': game_over, 'status': status}
+
+
+async def _read_line(reader):
+    """Like reader.readline, but a line over the stream limit is skipped whole and returns None"""
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        overrun = error
+    while True:
+        try:
+            await reader.readexactly(overrun.consumed)
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.IncompleteReadError:
+            return b''
+        except asyncio.LimitOverrunError as error:
+            overrun = error
+
+
+async def handle_connection(reader, writer, words):
+    session = GameSession(words)
+    try:
+        while True:
+            line = await _read_line(reader)
+            if line is None:
+                writer.write(json.dumps({'ok': False, 'error': "Request too long."}).encode() + b'\n')
+                await writer.drain()
+                continue
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                response = session.handle(request) if isinstance(request, dict) \
+                    else {'ok': False, 'error': "Request must be a JSON object."}
+            except ValueError:
+                response = {'ok': False, 'error': "Malformed JSON."}
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=5050, words=None):
+    """Serve games until cancelled"""
+    words = words if words else DEFAULT_WORDS
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, words), host, port, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+
+async def _client(host, port, games, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(request):
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b'\n')
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        return response
+
+    for _ in range(games):
+        await call({'cmd': 'new'})
+        for letter in "etaoinshrdlcumwfgypbvkjxqz":
+            if (await call({'cmd': 'guess', 'letter': letter})).get('game_over', True):
+                break
+        await call({'cmd': 'state'})
+    writer.close()
+
+
+async def run_load(host='127.0.0.1', port=5050, connections=500, games=20):
+    """
+    Drive the server with concurrent clients and measure it.
+
+    Returns:
+        dict: requests, seconds, requests_per_second, p50_ms and p99_ms
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, games, latencies) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hangman game server and load generator")
+    parser.add_argument('mode', choices=['serve', 'load'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--words', help="word file for 'serve'")
+    parser.add_argument('--connections', type=int, default=500)
+    parser.add_argument('--games', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        from hangman_wordfile import WordFile
+        words = WordFile(args.words) if args.words else None
+        asyncio.run(serve(args.host, args.port, words))
+    else:
+        print(json.dumps(asyncio.run(run_load(args.host, args.port, args.connections, args.games)), indent=2))
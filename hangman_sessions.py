@@ -0,0 +1,177 @@
+"""
+Compact game sessions and a bounded session store.
+
+A Session is five slots: word index, guessed-letter mask, revealed
+position mask, remaining tries and won/over flags. It holds no word
+string, set or list; the word's position table comes from the shared
+compile_word cache of the engine.
+
+SessionStore keeps the most recently used sessions in memory and spills
+the rest to a file of fixed-size records addressed by session id, so the
+resident set is bounded by the store capacity and not the session count.
+Records hold a 26-bit a-z guessed mask and words of up to 64 letters.
+"""
+import os
+import random
+import struct
+from collections import OrderedDict
+
+from hangman_engine import LETTER_BITS, compile_word, letters_from_mask, validate_letter
+
+RECORD = struct.Struct('<IIQbB')
+WON = 1
+OVER = 2
+PRESENT = 4
+
+
+class Session:
+    __slots__ = ('word_id', 'guessed', 'revealed', 'remaining_tries', 'flags')
+
+    def __init__(self, word_id, guessed=0, revealed=0, remaining_tries=6, flags=0):
+        self.word_id = word_id
+        self.guessed = guessed
+        self.revealed = revealed
+        self.remaining_tries = remaining_tries
+        self.flags = flags
+
+    def validate_guess(self, letter):
+        """
+        Validate a guess as GameLogic.validate_guess does; guesses after
+        the game is over are rejected as well.
+
+        Returns:
+            tuple: (bool, str) - (is_valid, error_message)
+        """
+        if self.flags & OVER:
+            return False, "The game is over."
+        return validate_letter(letter, self.guessed)
+
+    def guess(self, word, letter):
+        """
+        Apply a guess with GameLogic.make_guess + update_game_status rules.
+
+        Returns:
+            bool: True if the letter is in the word
+
+        Raises:
+            ValueError: If validate_guess rejects the guess
+        """
+        is_valid, error_message = self.validate_guess(letter)
+        if not is_valid:
+            raise ValueError(error_message)
+        letter = letter.lower()
+        positions, full_mask, _ = compile_word(word)
+        self.guessed |= LETTER_BITS[letter]
+        hit = positions.get(letter, 0)
+        if hit:
+            self.revealed |= hit
+        else:
+            self.remaining_tries -= 1
+        if self.revealed == full_mask:
+            self.flags |= WON | OVER
+        elif self.remaining_tries <= 0:
+            self.flags |= OVER
+        return bool(hit)
+
+    def game_state(self, word):
+        """Return the state in the form of GameLogic.get_game_state"""
+        revealed = self.revealed
+        return {
+            'word_state': ' '.join(char if revealed >> i & 1 else '_' for i, char in enumerate(word)),
+            'guessed_letters': sorted(letters_from_mask(self.guessed)),
+            'remaining_tries': self.remaining_tries,
+            'game_over': bool(self.flags & OVER),
+            'game_won': bool(self.flags & WON)
+        }
+
+    def pack(self):
+        return RECORD.pack(self.word_id, self.guessed, self.revealed,
+                           self.remaining_tries, self.flags | PRESENT)
+
+    @classmethod
+    def unpack(cls, record):
+        word_id, guessed, revealed, remaining_tries, flags = RECORD.unpack(record)
+        return cls(word_id, guessed, revealed, remaining_tries, flags & ~PRESENT)
+
+
+class SessionStore:
+    def __init__(self, words, path, capacity=100000, max_tries=6):
+        """
+        Open (or create) a session store.
+
+        Args:
+            words (sequence): Word list; sessions refer to it by index
+            path (str): Spill file for idle sessions
+            capacity (int): Sessions kept in memory before spilling
+            max_tries (int): Wrong guesses allowed per new game
+        """
+        self.words = words
+        self.capacity = capacity
+        self.max_tries = max_tries
+        self._live = OrderedDict()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._next_id = os.fstat(self._fd).st_size // RECORD.size
+
+    def new_game(self, word_id=None):
+        """Start a session and return its id"""
+        if word_id is None:
+            word_id = random.randrange(len(self.words))
+        session_id = self._next_id
+        self._next_id += 1
+        self._insert(session_id, Session(word_id, remaining_tries=self.max_tries))
+        return session_id
+
+    def get(self, session_id):
+        """Return a live Session, reloading it from disk if it was spilled"""
+        session = self._live.get(session_id)
+        if session is not None:
+            self._live.move_to_end(session_id)
+            return session
+        if 0 <= session_id < self._next_id:
+            record = os.pread(self._fd, RECORD.size, session_id * RECORD.size)
+            if len(record) == RECORD.size and record[-1] & PRESENT:
+                session = Session.unpack(record)
+                self._insert(session_id, session)
+                return session
+        raise KeyError(f"Unknown session: {session_id}")
+
+    def validate_guess(self, session_id, letter):
+        """Return (is_valid, error_message) for a guess in a session"""
+        return self.get(session_id).validate_guess(letter)
+
+    def guess(self, session_id, letter):
+        """
+        Apply a guess to a session.
+
+        Raises:
+            ValueError: If the guess is invalid or the game is over
+        """
+        session = self.get(session_id)
+        return session.guess(self.words[session.word_id], letter)
+
+    def game_state(self, session_id):
+        session = self.get(session_id)
+        return session.game_state(self.words[session.word_id])
+
+    def discard(self, session_id):
+        """Forget a session, e.g. once its game is over"""
+        self._live.pop(session_id, None)
+        if 0 <= session_id < self._next_id:
+            os.pwrite(self._fd, bytes(RECORD.size), session_id * RECORD.size)
+
+    def _insert(self, session_id, session):
+        self._live[session_id] = session
+        while len(self._live) > self.capacity:
+            self._spill(*self._live.popitem(last=False))
+
+    def _spill(self, session_id, session):
+        os.pwrite(self._fd, session.pack(), session_id * RECORD.size)
+
+    def flush(self):
+        """Write every live session to the spill file"""
+        for session_id, session in self._live.items():
+            self._spill(session_id, session)
+
+    def close(self):
+        self.flush()
+        os.close(self._fd)
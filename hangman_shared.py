@@ -0,0 +1,115 @@
+"""
+Dictionary shared across worker processes.
+
+The parent process builds the dictionary once into a
+multiprocessing.shared_memory block: a compiled dictionary image (word
+blob, offsets and per-length buckets, see hangman_compiled) followed by
+one bitmap per letter a-z marking the words that contain it. Workers
+attach by name and read it in place, so memory does not grow with the
+number of workers. SharedDictionary is a read-only sequence, so it can
+be handed straight to WordManager:
+
+    shared = SharedDictionary.create(HangmanGame.load_words("words.txt"))
+    # in each worker
+    word_manager = WordManager(SharedDictionary.attach(shared.name))
+"""
+import struct
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+
+from hangman_compiled import CompiledDictionary, encode_words
+from hangman_engine import ORD_A
+
+LAYOUT = struct.Struct('<QQ')  # dictionary image size, bytes per letter bitmap
+
+
+class SharedDictionary(Sequence):
+    def __init__(self, block, owner):
+        self._block = block
+        self._owner = owner
+        image_size, self._bitmap_size = LAYOUT.unpack_from(block.buf)
+        self._bitmaps_at = LAYOUT.size + image_size
+        self._bitmaps = {}  # letter -> view handed out, released by close()
+        self.dictionary = CompiledDictionary.from_buffer(block.buf[LAYOUT.size:self._bitmaps_at])
+
+    @classmethod
+    def create(cls, words, name=None):
+        """
+        Build the shared block in the parent process.
+
+        Args:
+            words (iterable): Validated words, e.g. from HangmanGame.load_words
+            name (str): Shared memory name; generated when omitted
+        """
+        image = encode_words(words)
+        dictionary = CompiledDictionary.from_buffer(image)
+        bitmap_size = (len(dictionary) + 7) // 8
+        bitmaps = [bytearray(bitmap_size) for _ in range(26)]
+        for word_id, word in enumerate(dictionary):
+            for letter in set(word.lower()):
+                bit = ord(letter) - ORD_A
+                if 0 <= bit < 26:
+                    bitmaps[bit][word_id >> 3] |= 1 << (word_id & 7)
+        dictionary.close()
+
+        block = shared_memory.SharedMemory(name=name, create=True,
+                                           size=LAYOUT.size + len(image) + 26 * bitmap_size)
+        LAYOUT.pack_into(block.buf, 0, len(image), bitmap_size)
+        block.buf[LAYOUT.size:LAYOUT.size + len(image)] = image
+        start = LAYOUT.size + len(image)
+        for bitmap in bitmaps:
+            block.buf[start:start + bitmap_size] = bitmap
+            start += bitmap_size
+        return cls(block, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a block created by another process, without copying it"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self._block.name
+
+    def __len__(self):
+        return len(self.dictionary)
+
+    def __getitem__(self, index):
+        return self.dictionary[index]
+
+    def bucket(self, length):
+        """Return the index range of the words with the given length"""
+        return self.dictionary.bucket(length)
+
+    def letter_bitmap(self, letter):
+        """
+        Return a read-only view of the bitmap of words containing letter.
+
+        The view is only valid until close(), which releases it; copy it
+        with bytes() to keep it longer.
+        """
+        view = self._bitmaps.get(letter)
+        if view is None:
+            start = self._bitmaps_at + (ord(letter) - ORD_A) * self._bitmap_size
+            view = self._bitmaps[letter] = self._block.buf[start:start + self._bitmap_size].toreadonly()
+        return view
+
+    def has_letter(self, word_id, letter):
+        position = self._bitmaps_at + (ord(letter) - ORD_A) * self._bitmap_size + (word_id >> 3)
+        return bool(self._block.buf[position] >> (word_id & 7) & 1)
+
+    def close(self):
+        """Detach; the creating process also frees the block"""
+        for view in self._bitmaps.values():
+            view.release()
+        self._bitmaps.clear()
+        self.dictionary.close()
+        self._block.close()
+        if self._owner:
+            self._block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,85 @@
+"""
+Non-repeating word rotation.
+
+ShuffleBag walks a word list in a pseudo-random order without copying or
+shuffling it. The order is a keyed Feistel permutation over the word
+indices, evaluated lazily with cycle walking, so a player's whole state
+is a seed and a counter: every word comes up once before any repeats,
+and each draw costs a few integer mixes whatever the list size.
+"""
+import random
+
+MASK64 = (1 << 64) - 1
+ROUNDS = 4
+
+
+def mix64(value):
+    """splitmix64 finalizer"""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK64
+    return value ^ (value >> 31)
+
+
+class FeistelPermutation:
+    def __init__(self, size, key):
+        """
+        A keyed permutation of range(size).
+
+        Args:
+            size (int): Number of elements
+            key (int): Permutation key; each key gives a different order
+        """
+        if size <= 0:
+            raise ValueError("Permutation size must be positive")
+        self.size = size
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        self.round_keys = [mix64(key * ROUNDS + r & MASK64) for r in range(ROUNDS)]
+
+    def _encrypt(self, value):
+        left, right = value >> self.half_bits, value & self.half_mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ (mix64(right ^ round_key) & self.half_mask)
+        return (left << self.half_bits) | right
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        # Cycle-walk until the result lands inside range(size)
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def __len__(self):
+        return self.size
+
+
+class ShuffleBag:
+    def __init__(self, size, seed=None, drawn=0):
+        """
+        Per-player rotation over a word list of the given size.
+
+        Args:
+            size (int): Number of words
+            seed (int): Player's seed; random when omitted
+            drawn (int): Draws already made, to resume a saved bag
+        """
+        self.size = size
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.drawn = drawn
+        self._epoch = None
+        self._permutation = None
+
+    def draw(self):
+        """Return the next word index; a new order starts after every full pass"""
+        epoch, position = divmod(self.drawn, self.size)
+        if epoch != self._epoch:
+            self._epoch = epoch
+            self._permutation = FeistelPermutation(self.size, mix64(self.seed ^ epoch))
+        self.drawn += 1
+        return self._permutation[position]
+
+    def state(self):
+        """Return (seed, drawn), enough to rebuild the bag with ShuffleBag(size, *state)"""
+        return self.seed, self.drawn
@@ -0,0 +1,128 @@
+"""
+Headless hangman simulation.
+
+Plays games without input() or print() by letting a guesser callable pick
+letters against HangmanEngine, the engine behind WordManager/GameLogic.
+Games are split into fixed-size chunks and each chunk is seeded from its
+index, so results are identical whatever the number of processes.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from hangman_engine import HangmanEngine
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+FREQUENCY_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+CHUNK_SIZE = 10000
+
+
+def random_guesser(engine, rng):
+    """Guess a random letter that has not been guessed yet"""
+    return rng.choice([letter for letter in ALPHABET if not engine.has_guessed(letter)])
+
+
+def frequency_guesser(engine, rng):
+    """Guess the most common English letter that has not been guessed yet"""
+    for letter in FREQUENCY_ORDER:
+        if not engine.has_guessed(letter):
+            return letter
+    raise ValueError("No letters left to guess")
+
+
+def play_game(engine, word, guesser, rng, max_tries=6):
+    """
+    Play one game to completion.
+
+    Args:
+        engine (HangmanEngine): Engine to play on (reused between games)
+        word (str): The word to be guessed
+        guesser (callable): guesser(engine, rng) -> letter
+        rng (random.Random): Random source passed to the guesser
+        max_tries (int): Wrong guesses allowed
+
+    Returns:
+        tuple: (bool, int) - (won, wrong_guesses)
+    """
+    engine.start(word, max_tries)
+    while not engine.is_over():
+        letter = guesser(engine, rng).lower()
+        if len(letter) != 1 or not letter.isalpha() or engine.has_guessed(letter):
+            raise ValueError(f"Guesser returned an invalid guess: {letter!r}")
+        engine.guess(letter)
+    return engine.is_won(), max_tries - engine.remaining_tries
+
+
+_worker_words = None
+
+
+def _init_worker(words):
+    global _worker_words
+    _worker_words = words
+
+
+def _run_chunk(args):
+    seed, chunk, games, guesser, max_tries, words = args
+    words = words if words is not None else _worker_words
+    rng = random.Random(seed * 1000003 + chunk)
+    engine = HangmanEngine(max_tries)
+    outcomes = {}
+    for _ in range(games):
+        word = rng.choice(words)
+        won, wrong = play_game(engine, word, guesser, rng, max_tries)
+        outcome = outcomes.get(word)
+        if outcome is None:
+            outcome = outcomes[word] = [0, 0, 0]
+        outcome[0] += 1
+        outcome[1] += won
+        outcome[2] += wrong
+    return outcomes
+
+
+def simulate(words, guesser, games, processes=None, seed=0, max_tries=6):
+    """
+    Simulate many games and aggregate the outcomes.
+
+    Args:
+        words (list): Word list to draw secret words from
+        guesser (callable): Picklable guesser(engine, rng) -> letter
+        games (int): Number of games to play
+        processes (int): Worker processes; None uses every core, 1 runs inline
+        seed (int): Base seed; chunk i is seeded from (seed, i)
+        max_tries (int): Wrong guesses allowed per game
+
+    Returns:
+        dict: games, wins, win_rate, mean_wrong_guesses and per_word
+            outcomes as {word: {'games', 'wins', 'wrong_guesses'}}
+    """
+    if not words:
+        raise ValueError("Word list is empty")
+    words = [word.lower() for word in words]
+    chunks = [(chunk, min(CHUNK_SIZE, games - start))
+              for chunk, start in enumerate(range(0, games, CHUNK_SIZE))]
+
+    if processes == 1 or len(chunks) <= 1:
+        results = [_run_chunk((seed, chunk, count, guesser, max_tries, words))
+                   for chunk, count in chunks]
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                 initargs=(words,)) as pool:
+            results = list(pool.map(_run_chunk, [(seed, chunk, count, guesser, max_tries, None)
+                                                 for chunk, count in chunks]))
+
+    per_word = {}
+    for outcomes in results:
+        for word, (played, won, wrong) in outcomes.items():
+            total = per_word.setdefault(word, {'games': 0, 'wins': 0, 'wrong_guesses': 0})
+            total['games'] += played
+            total['wins'] += won
+            total['wrong_guesses'] += wrong
+
+    wins = sum(total['wins'] for total in per_word.values())
+    wrong = sum(total['wrong_guesses'] for total in per_word.values())
+    return {
+        'games': games,
+        'wins': wins,
+        'win_rate': wins / games if games else 0.0,
+        'mean_wrong_guesses': wrong / games if games else 0.0,
+        'per_word': per_word
+    }
@@ -0,0 +1,92 @@
+"""
+Fixed-size binary game snapshots.
+
+A snapshot is 10 bytes: word id (uint32), guessed-letter mask (uint32,
+a-z), remaining tries (int8) and won/over flags (uint8). The revealed
+positions are not stored; they follow from the word and the guessed mask.
+
+Every function accepts a HangmanEngine or any view over one
+(GameLogic, WordManager, GameState, HangmanGame's word_manager), since
+they all share the engine's state.
+"""
+import struct
+
+from hangman_engine import HangmanEngine, letter_bit
+from hangman_sessions import OVER, WON
+
+SNAPSHOT = struct.Struct('<IIbB')
+LETTERS_MASK = (1 << 26) - 1
+
+
+def _engine_of(game):
+    return getattr(game, 'engine', game)
+
+
+def _fields(game, word_id=None):
+    engine = _engine_of(game)
+    word_id = engine.word_id if word_id is None else word_id
+    if word_id is None:
+        raise ValueError("Game has no word id; pass word_id or start it through WordManager")
+    if engine.guessed & ~LETTERS_MASK:
+        raise ValueError("Only a-z guesses can be snapshotted")
+    flags = (WON if engine.game_won else 0) | (OVER if engine.game_over else 0)
+    return word_id, engine.guessed, engine.remaining_tries, flags
+
+
+def snapshot(game, word_id=None):
+    """
+    Pack a game into a fixed-size snapshot.
+
+    Args:
+        game: HangmanEngine or a view over one
+        word_id (int): Word index, when the engine does not know it
+
+    Returns:
+        bytes: SNAPSHOT.size bytes
+    """
+    return SNAPSHOT.pack(*_fields(game, word_id))
+
+
+def _apply(engine, words, word_id, guessed, remaining_tries, flags):
+    # load(), not start(): a restored game continues, it is not logged anew
+    engine.load(words[word_id], word_id=word_id)
+    engine.guessed = guessed
+    engine.revealed = 0
+    for letter, mask in engine.positions.items():
+        if guessed & letter_bit(letter):
+            engine.revealed |= mask
+    if flags & WON:
+        # Won by a full-word guess without every letter guessed
+        engine.revealed = engine.full_mask
+    engine.remaining_tries = remaining_tries
+    engine.game_won = bool(flags & WON)
+    engine.game_over = bool(flags & OVER)
+    return engine
+
+
+def restore(game, data, words):
+    """
+    Load a snapshot into an existing game.
+
+    Args:
+        game: HangmanEngine or a view over one; every view sharing the
+            engine sees the restored state
+        data (bytes): Output of snapshot()
+        words (sequence): The word list the snapshot's word id refers to
+    """
+    _apply(_engine_of(game), words, *SNAPSHOT.unpack(data))
+
+
+def pack_many(games):
+    """Pack many games into one contiguous buffer"""
+    games = list(games)
+    buffer = bytearray(SNAPSHOT.size * len(games))
+    for i, game in enumerate(games):
+        SNAPSHOT.pack_into(buffer, i * SNAPSHOT.size, *_fields(game))
+    return buffer
+
+
+def unpack_many(buffer, words, max_tries=6):
+    """Restore every snapshot in a pack_many() buffer into new engines"""
+    return [_apply(HangmanEngine(max_tries), words, *fields)
+            for fields in SNAPSHOT.iter_unpack(buffer)]
@@ -0,0 +1,140 @@
+"""
+Hangman solver.
+
+Keeps the candidate words for the current game as a bitset over a
+WordIndex length bucket and narrows it after each guess using only that
+letter's (position, letter) bitsets. Letter statistics are computed
+bit-parallel over the whole candidate set with popcounts, so a decision
+costs a few big-int operations per letter however many candidates remain.
+
+Strategies:
+    'min_wrong'  pick the letter most likely to be in the word (default);
+                 one AND and popcount per letter, well under a millisecond
+                 even for the first guess on a 500k-word dictionary
+    'entropy'    pick the letter whose reveal pattern carries the most
+                 information about the word; this needs every letter's
+                 full partition into reveal patterns, not just counts, so
+                 early decisions on large dictionaries take tens of
+                 milliseconds. Use it offline (hangman_tree,
+                 hangman_difficulty) or on small dictionaries.
+"""
+from math import log2
+
+from hangman_index import WordIndex
+
+FREQUENCY_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+
+class Solver:
+    def __init__(self, index, strategy='min_wrong'):
+        """
+        Args:
+            index (WordIndex or list): Dictionary the secret word is drawn from
+            strategy (str): 'min_wrong' or 'entropy'; see the module
+                docstring for the cost of 'entropy'
+        """
+        if strategy not in ('entropy', 'min_wrong'):
+            raise ValueError(f"Unknown strategy: {strategy!r}")
+        self.index = index if isinstance(index, WordIndex) else WordIndex(index)
+        self.strategy = strategy
+        self.length = 0
+        self.candidates = 0
+        self.guessed = set()
+
+    def start(self, length):
+        """Reset for a new game on a word of the given length"""
+        self.length = length
+        self.candidates = self.index.live.get(length, 0)
+        self.guessed = set()
+
+    def observe(self, letter, word_state):
+        """
+        Narrow the candidates after a guess.
+
+        Args:
+            letter (str): The letter just guessed
+            word_state (list or str): GameLogic.word_state or a display string
+        """
+        slots = word_state.replace(' ', '') if isinstance(word_state, str) else word_state
+        self.guessed.add(letter)
+        position_letter = self.index.position_letter
+        length = self.length
+        if letter not in slots:
+            self.candidates &= ~self.index.letter_present.get((length, letter), 0)
+            return
+        for i, slot in enumerate(slots):
+            bits = position_letter.get((length, i, letter), 0)
+            if slot == letter:
+                self.candidates &= bits
+            else:
+                self.candidates &= ~bits
+
+    def candidate_words(self):
+        return self.index.words_for_mask(self.length, self.candidates)
+
+    def partition(self, letter):
+        """
+        Split the candidates by the reveal pattern a letter would produce.
+
+        Returns:
+            list: (positions, bitset) pairs; positions is a tuple of the
+                indices revealed, empty for the words without the letter
+        """
+        length = self.length
+        present = self.candidates & self.index.letter_present.get((length, letter), 0)
+        groups = [((), present)] if present else []
+        for i in range(length):
+            bits = self.index.position_letter.get((length, i, letter), 0)
+            if not bits & present:
+                continue
+            split = []
+            for positions, group in groups:
+                inside = group & bits
+                if inside:
+                    split.append((positions + (i,), inside))
+                if inside != group:
+                    split.append((positions, group & ~bits))
+            groups = split
+        missing = self.candidates & ~present
+        if missing:
+            groups.append(((), missing))
+        return groups
+
+    def _entropy(self, letter, total):
+        sizes = [group.bit_count() for _, group in self.partition(letter)]
+        return -sum(size / total * log2(size / total) for size in sizes)
+
+    def next_guess(self):
+        """Return the best letter to guess next"""
+        total = self.candidates.bit_count()
+        letters = [letter for letter in FREQUENCY_ORDER if letter not in self.guessed]
+        if not letters:
+            raise ValueError("No letters left to guess")
+        if total == 0:
+            return letters[0]
+        letter_present = self.index.letter_present
+        counts = {letter: (self.candidates & letter_present.get((self.length, letter), 0)).bit_count()
+                  for letter in letters}
+        useful = [letter for letter in letters if counts[letter]]
+        if not useful:
+            return letters[0]
+        if self.strategy == 'min_wrong' or total == 1:
+            return max(useful, key=counts.get)
+        return max(useful, key=lambda letter: (self._entropy(letter, total), counts[letter]))
+
+    def play(self, game_logic):
+        """
+        Play a started GameLogic game to the end.
+
+        Returns:
+            tuple: (bool, int) - (won, wrong_guesses)
+        """
+        self.start(len(game_logic.word))
+        start_tries = game_logic.remaining_tries
+        game_over = False
+        while not game_over:
+            letter = self.next_guess()
+            game_logic.make_guess(letter)
+            self.observe(letter, game_logic.word_state)
+            game_over, _ = game_logic.update_game_status()
+        return game_logic.game_won, start_tries - game_logic.remaining_tries
@@ -0,0 +1,300 @@
+"""
+Player and word statistics with a leaderboard.
+
+StatsStore keeps per-player aggregates (wins, losses, current and best
+win streak, wrong guesses) and per-word aggregates (wins, losses, wrong
+guesses) in SQLite. record_game() never touches the disk: it only folds
+the game into an in-memory delta for the player and the word. A
+background thread merges the deltas into the stored rows with one upsert
+each, in one transaction per flush_interval, so a player who finishes
+many games between flushes costs one row write. Opening the store only
+reads the top-N players. A failed write keeps the deltas and is retried
+on the next flush.
+
+Leaderboard keeps the top-N players by wins in a min-heap: an update is
+O(log N) and reading the board is independent of the number of players.
+It is fed the stored totals after each flush, so it trails the latest
+games by up to flush_interval.
+
+    stats = StatsStore("stats.db")
+    stats.record_game("ade", "python", won=True, wrong_guesses=2)
+    stats.flush()
+    stats.leaderboard()  # [('ade', 1)]
+"""
+import heapq
+import logging
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY, wins INTEGER, losses INTEGER,
+    streak INTEGER, best_streak INTEGER, wrong_guesses INTEGER);
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT PRIMARY KEY, wins INTEGER, losses INTEGER, wrong_guesses INTEGER);
+CREATE INDEX IF NOT EXISTS players_by_wins ON players (wins);
+"""
+# Stored row + delta; SET expressions see the stored row, and the extra
+# parameter is the delta's win run before its first loss
+SAVE_PLAYER = """
+INSERT INTO players VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses,
+    streak = CASE WHEN excluded.losses THEN excluded.streak ELSE streak + excluded.streak END,
+    best_streak = MAX(best_streak, excluded.best_streak, streak + ?),
+    wrong_guesses = wrong_guesses + excluded.wrong_guesses"""
+SAVE_WORD = """
+INSERT INTO words VALUES (?, ?, ?, ?) ON CONFLICT (word) DO UPDATE SET
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses,
+    wrong_guesses = wrong_guesses + excluded.wrong_guesses"""
+LOAD_PLAYER = "SELECT wins, losses, streak, best_streak, wrong_guesses FROM players WHERE name = ?"
+LOAD_WORD = "SELECT wins, losses, wrong_guesses FROM words WHERE word = ?"
+PLAYER_WINS = "SELECT wins FROM players WHERE name = ?"
+TOP_PLAYERS = "SELECT name, wins FROM players ORDER BY wins DESC, name LIMIT ?"
+
+logger = logging.getLogger(__name__)
+
+
+class WordStats:
+    __slots__ = ('wins', 'losses', 'wrong_guesses')
+
+    def __init__(self, wins=0, losses=0, wrong_guesses=0):
+        self.wins = wins
+        self.losses = losses
+        self.wrong_guesses = wrong_guesses
+
+    @property
+    def games(self):
+        return self.wins + self.losses
+
+    @property
+    def average_wrong_guesses(self):
+        return self.wrong_guesses / self.games if self.games else 0.0
+
+    def record(self, won, wrong_guesses):
+        if won:
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.wrong_guesses += wrong_guesses
+
+    def row(self):
+        return self.wins, self.losses, self.wrong_guesses
+
+    def add(self, delta):
+        """Fold in the games of a later delta"""
+        self.wins += delta.wins
+        self.losses += delta.losses
+        self.wrong_guesses += delta.wrong_guesses
+
+
+class PlayerStats(WordStats):
+    __slots__ = ('streak', 'best_streak')
+
+    def __init__(self, wins=0, losses=0, streak=0, best_streak=0, wrong_guesses=0):
+        super().__init__(wins, losses, wrong_guesses)
+        self.streak = streak
+        self.best_streak = best_streak
+
+    def record(self, won, wrong_guesses):
+        super().record(won, wrong_guesses)
+        self.streak = self.streak + 1 if won else 0
+        self.best_streak = max(self.best_streak, self.streak)
+
+    def row(self):
+        return self.wins, self.losses, self.streak, self.best_streak, self.wrong_guesses
+
+    def add(self, delta):
+        """Fold in the games of a later PlayerDelta, as SAVE_PLAYER does in SQL"""
+        self.best_streak = max(self.best_streak, delta.best_streak, self.streak + delta.lead)
+        self.streak = delta.streak if delta.losses else self.streak + delta.streak
+        super().add(delta)
+
+
+class PlayerDelta(PlayerStats):
+    """A player's games since the last flush"""
+    __slots__ = ('lead',)
+
+    def __init__(self):
+        super().__init__()
+        self.lead = 0  # wins before the first loss; they extend the stored streak
+
+    def record(self, won, wrong_guesses):
+        if won and not self.losses:
+            self.lead += 1
+        super().record(won, wrong_guesses)
+
+    def add(self, delta):
+        if not self.losses:
+            self.lead += delta.lead
+        super().add(delta)
+
+
+class Leaderboard:
+    def __init__(self, size=10):
+        """
+        Args:
+            size (int): Number of players on the board
+        """
+        self.size = size
+        self._heap = []  # (wins, name), lowest first; may hold stale entries
+        self._wins = {}  # name -> wins of its live heap entry
+
+    def offer(self, name, wins):
+        """
+        Report a player's new win count. Win counts only grow, so a
+        player on the board can only move up.
+        """
+        if name in self._wins:
+            # The player's older entry goes stale and is skipped later
+            self._wins[name] = wins
+            heapq.heappush(self._heap, (wins, name))
+            if len(self._heap) > 2 * self.size:
+                self._heap = [(w, n) for n, w in self._wins.items()]
+                heapq.heapify(self._heap)
+            return
+        if len(self._wins) < self.size:
+            self._wins[name] = wins
+            heapq.heappush(self._heap, (wins, name))
+            return
+        self._drop_stale()
+        if wins > self._heap[0][0]:
+            _, dropped = heapq.heapreplace(self._heap, (wins, name))
+            del self._wins[dropped]
+            self._wins[name] = wins
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._wins.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def top(self):
+        """Return [(name, wins)] best first"""
+        return sorted(self._wins.items(), key=lambda item: (-item[1], item[0]))
+
+
+class StatsStore:
+    def __init__(self, path, top_n=10, flush_interval=0.5):
+        """
+        Open (or create) the stats database and load the leaderboard.
+
+        Args:
+            path (str): SQLite database file
+            top_n (int): Players kept on the leaderboard
+            flush_interval (float): Seconds between background writes
+        """
+        self.flush_interval = flush_interval
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self.board = Leaderboard(top_n)
+        for name, wins in self._db.execute(TOP_PLAYERS, (top_n,)):
+            self.board.offer(name, wins)
+
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        # Games not yet merged into the stored rows
+        self._player_deltas = {}
+        self._word_deltas = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record_game(self, player, word, won, wrong_guesses):
+        """
+        Fold one finished game into the deltas; writes happen later.
+
+        Args:
+            player (str): Player name
+            word (str): The game's word
+            won (bool): Whether the player won
+            wrong_guesses (int): Tries used up by wrong guesses
+        """
+        with self._lock:
+            delta = self._player_deltas.get(player)
+            if delta is None:
+                delta = self._player_deltas[player] = PlayerDelta()
+            delta.record(won, wrong_guesses)
+            word_delta = self._word_deltas.get(word)
+            if word_delta is None:
+                word_delta = self._word_deltas[word] = WordStats()
+            word_delta.record(won, wrong_guesses)
+
+    def _load(self, query, deltas, key, stats_type):
+        # _db_lock first, as in flush(): no delta is half-written meanwhile
+        with self._db_lock:
+            row = self._db.execute(query, (key,)).fetchone()
+            with self._lock:
+                delta = deltas.get(key)
+                if row is None and delta is None:
+                    return None
+                stats = stats_type(*row) if row is not None else stats_type()
+                if delta is not None:
+                    stats.add(delta)
+                return stats
+
+    def player(self, name):
+        """Return a player's PlayerStats including unflushed games, or None if they never played"""
+        return self._load(LOAD_PLAYER, self._player_deltas, name, PlayerStats)
+
+    def word(self, word):
+        """Return a word's WordStats including unflushed games, or None if it was never played"""
+        return self._load(LOAD_WORD, self._word_deltas, word, WordStats)
+
+    def leaderboard(self):
+        """Return [(name, wins)] for the top players as of the last flush, best first"""
+        with self._lock:
+            return self.board.top()
+
+    def flush(self):
+        """Merge every delta into the stored rows in one transaction"""
+        # _db_lock keeps flushes in order; record_game only waits on _lock
+        with self._db_lock:
+            with self._lock:
+                players, self._player_deltas = self._player_deltas, {}
+                words, self._word_deltas = self._word_deltas, {}
+            if not players and not words:
+                return
+            try:
+                with self._db:
+                    self._db.executemany(SAVE_PLAYER, [(name, *delta.row(), delta.lead)
+                                                       for name, delta in players.items()])
+                    self._db.executemany(SAVE_WORD, [(word, *delta.row())
+                                                     for word, delta in words.items()])
+                    # Only a win can move a player up the board
+                    wins = [(name, self._db.execute(PLAYER_WINS, (name,)).fetchone()[0])
+                            for name, delta in players.items() if delta.wins]
+            except BaseException:
+                # Rolled back: put the deltas back in front of any newer games
+                with self._lock:
+                    self._restore(self._player_deltas, players)
+                    self._restore(self._word_deltas, words)
+                raise
+            with self._lock:
+                for name, total in wins:
+                    self.board.offer(name, total)
+
+    @staticmethod
+    def _restore(deltas, unsaved):
+        for key, delta in unsaved.items():
+            newer = deltas.get(key)
+            if newer is not None:
+                delta.add(newer)
+            deltas[key] = delta
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                logger.exception("Writing player statistics failed; retrying")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            self._db.close()
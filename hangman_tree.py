@@ -0,0 +1,155 @@
+"""
+Precomputed decision trees.
+
+For a fixed word list the solver's strategy is deterministic, so every
+state it can reach is enumerated offline and stored as a flat table
+keyed on what GameLogic already tracks: the word state and the guessed
+letters. At serve time the best next letter is a single dict lookup.
+
+Only the states the solver itself reaches are stored. A game that left
+that policy (a human player, another strategy) misses the table; pass a
+Solver over the same words to best_guess or lookup to fall back to it.
+
+Word lengths are independent subtrees and are built in parallel.
+
+Usage:
+    python hangman_tree.py words.txt words.tree
+"""
+import json
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from hangman_engine import letter_bit, sorted_letters
+from hangman_solver import Solver
+
+VERSION = 1
+
+
+def state_key(word_state, guessed_mask):
+    """Table key for a word state (list or string without spaces) and guessed mask"""
+    return f"{''.join(word_state)}:{guessed_mask}"
+
+
+def _build_length(args):
+    words, strategy, max_tries = args
+    solver = Solver(words, strategy)
+    solver.start(len(words[0]))
+    table = {}
+
+    def visit(word_state, guessed_mask, wrong):
+        letter = solver.next_guess()
+        table[state_key(word_state, guessed_mask)] = letter
+        candidates, guessed = solver.candidates, solver.guessed
+        for positions, group in solver.partition(letter):
+            next_state = list(word_state)
+            for i in positions:
+                next_state[i] = letter
+            next_wrong = wrong + (not positions)
+            if '_' not in next_state or next_wrong >= max_tries:
+                continue
+            solver.candidates, solver.guessed = group, guessed | {letter}
+            visit(next_state, guessed_mask | letter_bit(letter), next_wrong)
+        solver.candidates, solver.guessed = candidates, guessed
+
+    visit(['_'] * len(words[0]), 0, 0)
+    return table
+
+
+def build_tree(words, strategy='entropy', max_tries=6, processes=None):
+    """
+    Enumerate the solver's decisions for every reachable state.
+
+    Args:
+        words (iterable): The fixed word list games draw from
+        strategy (str): Solver strategy to freeze
+        max_tries (int): Wrong guesses allowed; deeper states are skipped
+        processes (int): Worker processes; None uses every core, 1 runs inline
+
+    Returns:
+        dict: {state_key: letter}
+    """
+    by_length = {}
+    for word in dict.fromkeys(word.lower() for word in words):
+        by_length.setdefault(len(word), []).append(word)
+    jobs = [(bucket, strategy, max_tries) for _, bucket in sorted(by_length.items())]
+    if processes == 1 or len(jobs) <= 1:
+        tables = map(_build_length, jobs)
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            tables = list(pool.map(_build_length, jobs))
+    table = {}
+    for part in tables:
+        table.update(part)
+    return table
+
+
+def save_tree(table, path):
+    data = json.dumps({'version': VERSION, 'table': table}, separators=(',', ':'))
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(zlib.compress(data.encode(), 9))
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=8)
+def _load(path, mtime_ns):
+    with open(path, 'rb') as f:
+        data = json.loads(zlib.decompress(f.read()))
+    if data.get('version') != VERSION:
+        raise ValueError(f"'{path}' is not a version {VERSION} decision tree")
+    return DecisionTree(data['table'])
+
+
+def load_tree(path):
+    """Load a saved tree; recently used trees are served from an LRU cache"""
+    return _load(path, os.stat(path).st_mtime_ns)
+
+
+class DecisionTree:
+    def __init__(self, table):
+        self.table = table
+
+    def best_guess(self, game_logic, solver=None):
+        """
+        Return the precomputed next letter for a GameLogic game.
+
+        Args:
+            game_logic: GameLogic, HangmanEngine or another view over one
+            solver (Solver): Asked instead when the state is not in the tree
+
+        Returns:
+            str: The letter, or None if the state is not in the tree and
+                no solver was given
+        """
+        engine = getattr(game_logic, 'engine', game_logic)
+        return self._get(engine.revealed_letters(), engine.guessed, solver)
+
+    def lookup(self, word_state, guessed_letters, solver=None):
+        """Return the next letter for a word state and a set of guessed letters"""
+        mask = 0
+        for letter in guessed_letters:
+            mask |= letter_bit(letter)
+        return self._get(word_state.replace(' ', '') if isinstance(word_state, str)
+                         else word_state, mask, solver)
+
+    def _get(self, word_state, guessed_mask, solver):
+        letter = self.table.get(state_key(word_state, guessed_mask))
+        if letter is not None or solver is None:
+            return letter
+        # Off the tree's policy: replay the guesses into the live solver
+        solver.start(len(word_state))
+        for guessed in sorted_letters(guessed_mask):
+            solver.observe(guessed, word_state)
+        return solver.next_guess()
+
+
+if __name__ == "__main__":
+    from hangman_wordfile import WordFile
+
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python hangman_tree.py <words.txt> <output.tree>")
+    with WordFile(sys.argv[1]) as source:
+        save_tree(build_tree(source), sys.argv[2])
@@ -0,0 +1,161 @@
+"""
+Weighted word selection with alias tables.
+
+AliasTable draws a word index with probability proportional to its
+weight in O(1) using Vose's alias method. The words are split into
+fixed-size blocks, each with its own alias table, plus a top-level table
+over the block totals. Changing some weights only rebuilds the blocks
+they fall in and the small top-level table, so weights can be updated
+without reloading the dictionary or rebuilding everything.
+
+Weights live next to the word file (words.txt -> words.weights), one
+"word weight" pair per line; words without an entry get weight 1.
+"""
+import os
+import random
+
+import numpy as np
+
+BLOCK_SIZE = 4096
+
+
+def _vose(weights):
+    """Return (prob, alias) lists for weights, indices local to the list"""
+    n = len(weights)
+    total = sum(weights)
+    prob = [0.0] * n
+    alias = list(range(n))
+    if total <= 0:
+        return prob, alias
+    scaled = [weight * n / total for weight in weights]
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    for i in small + large:
+        prob[i] = 1.0
+    return prob, alias
+
+
+class AliasTable:
+    def __init__(self, weights, block_size=BLOCK_SIZE):
+        """
+        Args:
+            weights (sequence): Non-negative weight per word index
+            block_size (int): Words per independently rebuildable block
+        """
+        self.weights = np.asarray(weights, dtype=np.float64).copy()
+        if len(self.weights) == 0 or (self.weights < 0).any():
+            raise ValueError("Weights must be non-empty and non-negative")
+        self.block_size = block_size
+        n = len(self.weights)
+        self.prob = np.zeros(n)
+        self.alias = np.zeros(n, dtype=np.int64)
+        self.block_totals = np.zeros((n + block_size - 1) // block_size)
+        for block in range(len(self.block_totals)):
+            self._build_block(block)
+        self._build_top()
+
+    def _build_block(self, block):
+        start = block * self.block_size
+        weights = self.weights[start:start + self.block_size]
+        prob, alias = _vose(weights.tolist())
+        self.prob[start:start + len(weights)] = prob
+        self.alias[start:start + len(weights)] = np.asarray(alias) + start
+        self.block_totals[block] = weights.sum()
+
+    def _build_top(self):
+        if self.block_totals.sum() <= 0:
+            raise ValueError("At least one weight must be positive")
+        prob, alias = _vose(self.block_totals.tolist())
+        self.top_prob = np.asarray(prob)
+        self.top_alias = np.asarray(alias, dtype=np.int64)
+        self._top = (prob, alias)
+        self._block_lengths = np.minimum(self.block_size,
+                                         len(self.weights) - np.arange(len(prob)) * self.block_size)
+
+    def update(self, changes):
+        """
+        Change some weights, rebuilding only the affected blocks.
+
+        Args:
+            changes (dict): {word index: new weight}
+        """
+        blocks = set()
+        for index, weight in changes.items():
+            if weight < 0:
+                raise ValueError("Weights must be non-negative")
+            self.weights[index] = weight
+            blocks.add(index // self.block_size)
+        for block in blocks:
+            self._build_block(block)
+        self._build_top()
+
+    def extend(self, weights):
+        """Append weights for new word indices, rebuilding only the tail blocks"""
+        first_block = len(self.weights) // self.block_size
+        added = np.asarray(weights, dtype=np.float64)
+        if (added < 0).any():
+            raise ValueError("Weights must be non-negative")
+        self.weights = np.concatenate([self.weights, added])
+        self.prob = np.concatenate([self.prob, np.zeros(len(added))])
+        self.alias = np.concatenate([self.alias, np.zeros(len(added), dtype=np.int64)])
+        blocks = (len(self.weights) + self.block_size - 1) // self.block_size
+        self.block_totals = np.concatenate([self.block_totals,
+                                            np.zeros(blocks - len(self.block_totals))])
+        for block in range(first_block, blocks):
+            self._build_block(block)
+        self._build_top()
+
+    def copy(self):
+        """Return a table that can be updated without affecting this one"""
+        table = AliasTable.__new__(AliasTable)
+        table.__dict__.update(self.__dict__)
+        for name in ('weights', 'prob', 'alias', 'block_totals'):
+            setattr(table, name, getattr(self, name).copy())
+        return table
+
+    def draw(self, rng=random):
+        """Draw one word index"""
+        top_prob, top_alias = self._top
+        block = rng.randrange(len(top_prob))
+        if rng.random() >= top_prob[block]:
+            block = top_alias[block]
+        start = block * self.block_size
+        index = start + rng.randrange(min(self.block_size, len(self.weights) - start))
+        if rng.random() >= self.prob[index]:
+            index = int(self.alias[index])
+        return index
+
+    def draw_many(self, count, seed=None):
+        """Draw count word indices at once as a NumPy array"""
+        rng = np.random.default_rng(seed)
+        blocks = rng.integers(0, len(self.top_prob), count)
+        blocks = np.where(rng.random(count) < self.top_prob[blocks], blocks, self.top_alias[blocks])
+        index = blocks * self.block_size + (rng.random(count) * self._block_lengths[blocks]).astype(np.int64)
+        return np.where(rng.random(count) < self.prob[index], index, self.alias[index])
+
+
+def weights_path(word_file):
+    """Return the weights file that sits next to a word file"""
+    return os.path.splitext(word_file)[0] + '.weights'
+
+
+def load_weights(words, path):
+    """
+    Read "word weight" lines and align them with a word list.
+
+    Returns:
+        list: Weight per word index (1.0 for words without an entry)
+    """
+    by_word = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2:
+                by_word[parts[0].lower()] = float(parts[1])
+    return [by_word.get(word.lower(), 1.0) for word in words]
@@ -0,0 +1,110 @@
+"""
+Memory-mapped word files.
+
+WordFile maps a word file read-only and records the byte span of every
+valid line in two offset arrays. Lines follow the HangmanGame.load_words
+rule (stripped, non-empty, isalpha) but are only decoded to str when
+indexed, so a multi-hundred-MB dictionary costs 16 bytes per word plus
+shared page cache instead of one Python string per line.
+"""
+import mmap
+import os
+from array import array
+from collections.abc import Sequence
+from string import ascii_letters
+
+import numpy as np
+
+# Bytes that can make a line more than a bare ASCII word; \r counts only
+# when it is not the end of a CRLF line
+_OTHER_BYTE = np.ones(256, dtype=bool)
+_OTHER_BYTE[np.frombuffer(ascii_letters.encode() + b'\n', np.uint8)] = False
+_CHUNK = 1 << 20
+
+
+def _is_word(line):
+    try:
+        return line.decode('utf-8').isalpha()
+    except UnicodeDecodeError:
+        return False
+
+
+class WordFile(Sequence):
+    def __init__(self, filename):
+        """
+        Map a word file and index its valid lines.
+
+        Args:
+            filename (str): Path to a newline-separated word file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file contains no valid words
+        """
+        self.filename = filename
+        try:
+            with open(filename, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise ValueError("File contains no valid words")
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Word file '{filename}' not found")
+
+        self._index_lines()
+        if not self._starts:
+            self.close()
+            raise ValueError("File contains no valid words")
+
+    def _index_lines(self):
+        # numpy scans the mapping itself in chunks, so the file is never
+        # copied or split into per-line objects. Only the lines holding some
+        # other byte (whitespace, digits, non-ASCII) are looked at in Python.
+        data = np.frombuffer(self._map, np.uint8)
+        size = len(data)
+        newlines, others = [], []
+        for i in range(0, size, _CHUNK):
+            chunk = data[i:i + _CHUNK]
+            newlines.append(np.flatnonzero(chunk == 10) + i)
+            others.append(np.flatnonzero(_OTHER_BYTE[chunk]) + i)
+        newlines = np.concatenate(newlines)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.append(newlines, size)
+        del newlines
+        crlf = ends > starts
+        crlf[crlf] = data[ends[crlf] - 1] == 13
+        ends[crlf] -= 1
+        del data, crlf  # The mapping cannot close while numpy holds a view of it
+
+        others = np.concatenate(others)
+        lines = np.searchsorted(starts, others, 'right') - 1
+        for i in np.unique(lines[others < ends[lines]]).tolist():
+            start = int(starts[i])
+            line = self._map[start:int(ends[i])]
+            word = line.strip()
+            if word and _is_word(word):
+                starts[i] = start + len(line) - len(line.lstrip())
+                ends[i] = starts[i] + len(word)
+            else:
+                ends[i] = starts[i]
+        valid = ends > starts
+        self._starts = array('q')
+        self._starts.frombytes(memoryview(starts[valid]).cast('B'))
+        self._ends = array('q')
+        self._ends.frombytes(memoryview(ends[valid]).cast('B'))
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._map[self._starts[index]:self._ends[index]].decode('utf-8')
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
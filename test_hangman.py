@@ -0,0 +1,1346 @@
+"""
+Behaviour tests for the hangman_* modules.
+
+The game classes live in 5_Ade_full_Game.py, which cannot be imported by
+name, so it is loaded from its path once for every test case.
+
+Usage:
+    python -m unittest test_hangman
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import unittest
+from unittest import mock
+
+import hangman_metrics as metrics
+from hangman_bloom import BloomFilter, Lexicon, build_lexicon, exact_path
+from hangman_batch import BatchGames, WordTable
+from hangman_benchmark import benchmarks, compare, make_words, measure
+from hangman_dawg import Dawg
+from hangman_difficulty import DifficultyIndex, load_scores, score_words, update_scores
+from hangman_compiled import CompiledDictionary, compile_words, encode_words, is_compiled
+from hangman_engine import HangmanEngine
+from hangman_eventlog import EventLog, compact, replay as replay_log, segments
+from hangman_evil import EvilEngine
+from hangman_gameid import game_parameters, game_word_id, replay
+from hangman_index import WordIndex, bit_indices, parse_pattern
+from hangman_reload import DictionaryVersion, DictionaryWatcher
+from hangman_server import GameSession, handle_connection
+from hangman_sessions import SessionStore
+from hangman_solver import Solver
+from hangman_weights import AliasTable, load_weights, weights_path
+from hangman_utils import load_game_module
+from hangman_tree import DecisionTree, build_tree, load_tree, save_tree
+from hangman_shuffle import FeistelPermutation, ShuffleBag
+from hangman_snapshot import SNAPSHOT, pack_many, restore, snapshot, unpack_many
+from hangman_stats import PlayerStats, StatsStore
+from hangman_shared import SharedDictionary
+from hangman_simulation import frequency_guesser, play_game, random_guesser, simulate
+from hangman_wordfile import WordFile
+
+game = load_game_module()
+
+WORDS = ["python", "java", "kotlin", "galaxy", "puzzle", "mystery"]
+
+
+class TestEngineViews(unittest.TestCase):
+
+    def setUp(self):
+        self.word_manager = game.WordManager(["python"])
+        self.word_manager.select_word()
+        self.game_state = game.GameState(engine=self.word_manager.engine)
+        self.game_logic = game.GameLogic(engine=self.word_manager.engine)
+
+    def test_views_share_one_game(self):
+        self.game_state.guess_letter("p", self.word_manager)
+        self.game_logic.make_guess("z")
+        self.assertEqual(self.word_manager.get_display_word(), "p _ _ _ _ _")
+        self.assertEqual(self.game_state.remaining_tries, 5)
+        self.assertEqual(self.game_logic.guessed_letters, {"p", "z"})
+
+    def test_matches_reference_rules(self):
+        # Same outcome as playing the rules out by hand with sets
+        for letters in ("pythonx", "zxqwvbm", "ptzyhqo", "nohtyp"):
+            engine = HangmanEngine()
+            engine.start("python")
+            guessed, tries = set(), 6
+            for letter in letters:
+                if letter in guessed or tries == 0 or guessed >= set("python"):
+                    continue
+                guessed.add(letter)
+                tries -= letter not in "python"
+                engine.guess(letter)
+            self.assertEqual(engine.remaining_tries, tries)
+            self.assertEqual(engine.is_won(), guessed >= set("python"))
+            self.assertEqual(engine.display_word(),
+                             " ".join(c if c in guessed else "_" for c in "python"))
+
+    def test_uppercase_guess(self):
+        hangman = game.HangmanGame(["python"])
+        self.assertTrue(hangman.guess("P"))
+        self.assertEqual(hangman.get_display_word(), "p _ _ _ _ _")
+        with self.assertRaises(ValueError):
+            hangman.guess("p")
+
+    def test_non_ascii_guess_rejected(self):
+        for guess in ("İ", "é", "ß"):
+            is_valid, _ = self.game_logic.validate_guess(guess)
+            self.assertFalse(is_valid)
+
+    def test_guess_off_a_to_z_is_a_wrong_guess(self):
+        for letter in ("1", "é", "İ", "?"):
+            self.assertFalse(self.game_state.guess_letter(letter, self.word_manager))
+        self.assertEqual(self.game_state.remaining_tries, 2)
+        self.assertEqual(self.word_manager.engine.guessed, 0)
+        snapshot(self.word_manager.engine)  # Only a-z bits, so it packs
+
+    def test_guess_off_a_to_z_reveals_it(self):
+        word_manager = game.WordManager(["café"])
+        word_manager.select_word()
+        game_state = game.GameState(engine=word_manager.engine)
+        self.assertTrue(game_state.guess_letter("É", word_manager))
+        self.assertEqual(word_manager.get_display_word(), "_ _ _ é")
+        self.assertEqual(word_manager.engine.guessed, 0)
+
+    def test_unbound_state_keeps_its_max_tries(self):
+        self.word_manager.engine.guess("z")
+        game_state = game.GameState(max_tries=3)
+        self.assertFalse(game_state.guess_letter("q", self.word_manager))
+        self.assertEqual(game_state.remaining_tries, 1)
+
+    def test_get_game_state(self):
+        self.game_logic.start_new_game("java")
+        self.game_logic.make_guess("a")
+        self.game_logic.update_game_status()
+        self.assertEqual(self.game_logic.get_game_state(), {
+            'word_state': '_ a _ a', 'guessed_letters': ['a'],
+            'remaining_tries': 6, 'game_over': False, 'game_won': False})
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_results_independent_of_process_count(self):
+        inline = simulate(WORDS, frequency_guesser, 25000, processes=1, seed=7)
+        pooled = simulate(WORDS, frequency_guesser, 25000, processes=2, seed=7)
+        self.assertEqual(inline, pooled)
+
+    def test_totals_add_up(self):
+        result = simulate(WORDS, random_guesser, 500, processes=1, seed=1)
+        self.assertEqual(sum(w['games'] for w in result['per_word'].values()), 500)
+        self.assertEqual(result['wins'], sum(w['wins'] for w in result['per_word'].values()))
+
+    def test_play_game_outcomes(self):
+        # Frequency order starts e, t, a, o, i, n, s
+        self.assertEqual(play_game(HangmanEngine(), "tea", frequency_guesser, random.Random(0)), (True, 0))
+        self.assertEqual(play_game(HangmanEngine(), "jazz", frequency_guesser, random.Random(0)), (False, 6))
+
+    def test_invalid_guesser(self):
+        with self.assertRaises(ValueError):
+            play_game(HangmanEngine(), "java", lambda engine, rng: "ab", random.Random(0))
+        with self.assertRaises(ValueError):
+            simulate([], frequency_guesser, 10)
+
+
+class TestBatchGames(unittest.TestCase):
+
+    def test_matches_engine(self):
+        table = WordTable(WORDS)
+        batch = BatchGames(table, range(len(WORDS)))
+        engines = []
+        for word in WORDS:
+            engine = HangmanEngine()
+            engine.start(word)
+            engines.append(engine)
+        rng = random.Random(3)
+        for _ in range(12):
+            letters = [rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in WORDS]
+            batch.step(BatchGames.letters_to_indices(letters))
+            for engine, letter in zip(engines, letters):
+                # The batch skips repeats and finished games
+                if not engine.game_over and not engine.has_guessed(letter):
+                    engine.guess(letter)
+                    engine.update_status()
+        for i, engine in enumerate(engines):
+            self.assertEqual(batch.get_game_state(i), engine.game_state())
+
+    def test_skip_and_unbatchable_words(self):
+        batch = BatchGames(WordTable(["java"]), [0])
+        self.assertFalse(batch.step([-1])[0])
+        self.assertEqual(batch.get_game_state(0)['remaining_tries'], 6)
+        with self.assertRaises(ValueError):
+            WordTable(["café"])
+
+
+def _brute_force(words, pattern, wrong=()):
+    slots = parse_pattern(pattern)
+    revealed = {letter for letter in slots if letter}
+    return [word for word in words if len(word) == len(slots)
+            and all(c == s if s else c not in revealed for c, s in zip(word, slots))
+            and not set(word) & set(wrong)]
+
+
+class TestWordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["python", "jython", "cython", "kotlin", "java", "lava", "jazz", "puzzle"]
+        self.index = WordIndex(self.words)
+
+    def test_query_matches_brute_force(self):
+        for pattern, wrong in (("_ y t h _ n", ()), ("_ y t h _ n", "c"), ("_ a _ a", ()),
+                               ("_ a _ _", "v"), ("______", ()), ("___", ())):
+            self.assertEqual(self.index.query(pattern, wrong), _brute_force(self.words, pattern, wrong))
+            self.assertEqual(self.index.count(pattern, wrong), len(_brute_force(self.words, pattern, wrong)))
+
+    def test_update_and_copy(self):
+        snapshot = self.index.copy()
+        self.index.update(inserted=["gython"], deleted=["jython", "missing"])
+        self.assertEqual(self.index.query("_ y t h _ n"), ["python", "cython", "gython"])
+        self.assertEqual(snapshot.query("_ y t h _ n"), ["python", "jython", "cython"])
+        self.assertEqual(len(self.index), len(self.words))
+
+    def test_duplicates_indexed_once(self):
+        index = WordIndex(["java", "Java", "java"])
+        self.assertEqual(index.query("j___"), ["java"])
+        index.remove("java")
+        self.assertEqual(len(index), 0)
+
+    def test_bit_indices(self):
+        self.assertEqual(bit_indices(0b101001), [0, 3, 5])
+        self.assertEqual(bit_indices(0), [])
+
+
+def _write(directory, name, data):
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+class TestWordFile(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = self._tmp.name
+
+    def test_matches_load_words(self):
+        data = "python\n  java \n\n12ab\ncafé\nsnake case\n\tkotlin\nété".encode('utf-8') + b"\n\xff\n"
+        path = _write(self.dir, "words.txt", data)
+        with open(path, encoding='utf-8', errors='replace') as f:
+            expected = [line.strip() for line in f if line.strip() and line.strip().isalpha()]
+        with WordFile(path) as words:
+            self.assertEqual(list(words), expected)
+            self.assertEqual(len(words), 5)
+            self.assertEqual(words[-1], "été")
+
+    def test_crlf_and_no_trailing_newline(self):
+        path = _write(self.dir, "words.txt", b"python\r\njava\r\n bad\rline\r\nkotlin")
+        with WordFile(path) as words:
+            self.assertEqual(list(words), ["python", "java", "kotlin"])
+
+    def test_lines_across_scan_chunks(self):
+        data = "python\r\n  java \r\ncafé\n\r\nsnake case\nkotlin\r".encode('utf-8')
+        path = _write(self.dir, "words.txt", data)
+        with mock.patch("hangman_wordfile._CHUNK", 3), WordFile(path) as words:
+            self.assertEqual(list(words), ["python", "java", "café", "kotlin"])
+
+    def test_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            WordFile(os.path.join(self.dir, "missing.txt"))
+        for data in (b"", b"123\n\n a b \n"):
+            with self.assertRaises(ValueError):
+                WordFile(_write(self.dir, "bad.txt", data))
+
+
+class TestCompiledDictionary(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "words.hgd")
+        self.words = WORDS + ["café", "été", "naïve"]
+        compile_words(self.words, self.path)
+
+    def test_round_trip(self):
+        self.assertTrue(is_compiled(self.path))
+        with CompiledDictionary(self.path, verify=True) as dictionary:
+            self.assertEqual(sorted(dictionary), sorted(self.words))
+            self.assertEqual(len(dictionary), len(self.words))
+            self.assertEqual(dictionary[-1], dictionary[len(self.words) - 1])
+            with self.assertRaises(IndexError):
+                dictionary[len(self.words)]
+            self.assertIn("naïve", dictionary)
+            self.assertNotIn("naive", dictionary)
+
+    def test_sorted_membership(self):
+        compile_words(self.words, self.path, sort=True)
+        with CompiledDictionary(self.path, verify=True) as dictionary:
+            self.assertEqual(list(dictionary), sorted(self.words, key=lambda word: (len(word), word)))
+            for word in self.words:
+                self.assertIn(word, dictionary)
+            for word in ("", "javaa", "naive", "zzzz", "été" * 3):
+                self.assertNotIn(word, dictionary)
+
+    def test_buckets_count_characters(self):
+        with CompiledDictionary(self.path) as dictionary:
+            self.assertEqual(dictionary.lengths(), [3, 4, 5, 6, 7])
+            for length in dictionary.lengths():
+                self.assertEqual(sorted(dictionary[i] for i in dictionary.bucket(length)),
+                                 sorted(word for word in self.words if len(word) == length))
+            self.assertEqual(dictionary.bucket(2), range(0))
+
+    def test_from_buffer(self):
+        dictionary = CompiledDictionary.from_buffer(encode_words(["java", "été"]))
+        self.assertEqual(list(dictionary), ["été", "java"])
+        dictionary.close()
+
+    def test_errors(self):
+        with self.assertRaises(FileNotFoundError):
+            CompiledDictionary(self.path + ".missing")
+        with self.assertRaises(ValueError):
+            encode_words([])
+        for data in (b"", b"python\n", b"HGDICT\r\n" + bytes(60)):
+            with self.assertRaises(ValueError):
+                CompiledDictionary(_write(self._tmp.name, "bad.hgd", data))
+        with open(self.path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+        with self.assertRaises(ValueError):
+            CompiledDictionary(self.path, verify=True)
+
+
+class TestServer(unittest.TestCase):
+
+    def test_session_matches_game_logic(self):
+        session = GameSession(["java"])
+        self.assertFalse(session.handle({'cmd': 'state'})['ok'])
+        self.assertEqual(session.handle({'cmd': 'new'})['state']['word_state'], "_ _ _ _")
+        self.assertEqual(session.handle({'cmd': 'guess', 'letter': 'A'}), {
+            'ok': True, 'correct': True, 'message': "Correct guess!",
+            'game_over': False, 'status': "Remaining tries: 6"})
+        for letter in ("a", "İ", "ab", ""):
+            self.assertFalse(session.handle({'cmd': 'guess', 'letter': letter})['ok'])
+        for letter in "zxqwt":
+            session.handle({'cmd': 'guess', 'letter': letter})
+        response = session.handle({'cmd': 'guess', 'letter': 'y'})
+        self.assertEqual((response['game_over'], response['status']),
+                         (True, "Game Over! The word was: java"))
+        self.assertFalse(session.handle({'cmd': 'guess', 'letter': 'j'})['ok'])
+        self.assertFalse(session.handle({'cmd': 'bogus'})['ok'])
+
+    def test_connection_survives_bad_lines(self):
+        async def exchange():
+            server = await asyncio.start_server(
+                lambda reader, writer: handle_connection(reader, writer, ["python"]), '127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(b'{"cmd": "new"}\n' + b'x' * 200000 + b'\n[1]\n{bad\n'
+                         b'{"cmd": "guess", "letter": "p"}\n')
+            writer.write_eof()
+            responses = [json.loads(line) async for line in reader]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return responses
+
+        responses = asyncio.run(exchange())
+        self.assertEqual([response['ok'] for response in responses], [True, False, False, False, True])
+        self.assertEqual(responses[1]['error'], "Request too long.")
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "sessions.bin")
+
+    def test_matches_game_logic(self):
+        store = SessionStore(WORDS, self.path)
+        self.addCleanup(store.close)
+        game_logic = game.GameLogic()
+        for word_id, letters in ((0, "pXythonq"), (1, "zqwxbmj"), (5, "MYSTERy")):
+            session_id = store.new_game(word_id)
+            game_logic.start_new_game(WORDS[word_id])
+            for letter in letters:
+                if game_logic.game_over:
+                    break
+                self.assertEqual(store.validate_guess(session_id, letter),
+                                 game_logic.validate_guess(letter))
+                if game_logic.validate_guess(letter)[0]:
+                    self.assertEqual(store.guess(session_id, letter), game_logic.make_guess(letter)[0])
+                    game_logic.update_game_status()
+            self.assertEqual(store.game_state(session_id), game_logic.get_game_state())
+
+    def test_rejects_repeats_and_finished_games(self):
+        store = SessionStore(["java"], self.path)
+        self.addCleanup(store.close)
+        session_id = store.new_game()
+        store.guess(session_id, "j")
+        for letter in ("j", "J", "İ", "ab"):
+            with self.assertRaises(ValueError):
+                store.guess(session_id, letter)
+        for letter in "av":
+            store.guess(session_id, letter)
+        self.assertTrue(store.game_state(session_id)['game_won'])
+        self.assertEqual(store.validate_guess(session_id, "z"), (False, "The game is over."))
+        with self.assertRaises(ValueError):
+            store.guess(session_id, "z")
+        self.assertEqual(store.game_state(session_id)['remaining_tries'], 6)
+
+    def test_spill_and_reload(self):
+        store = SessionStore(WORDS, self.path, capacity=2)
+        ids = [store.new_game(i) for i in range(len(WORDS))]
+        for session_id in ids:
+            store.guess(session_id, "y")
+        self.assertEqual(len(store._live), 2)
+        states = [store.game_state(session_id) for session_id in ids]
+        store.discard(ids[0])
+        with self.assertRaises(KeyError):
+            store.get(ids[0])
+        store.close()
+
+        store = SessionStore(WORDS, self.path, capacity=2)
+        self.addCleanup(store.close)
+        self.assertEqual([store.game_state(session_id) for session_id in ids[1:]], states[1:])
+        with self.assertRaises(KeyError):
+            store.get(ids[0])
+        self.assertEqual(store.new_game(0), len(ids))
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def _played(self, word_id, letters):
+        engine = HangmanEngine()
+        engine.start(WORDS[word_id], word_id=word_id)
+        for letter in letters:
+            engine.guess(letter)
+            engine.update_status()
+        return engine
+
+    def test_round_trip_through_views(self):
+        for word_id, letters in ((0, "pyz"), (3, "qwertu"), (5, "mysterz")):
+            data = snapshot(self._played(word_id, letters))
+            self.assertEqual(len(data), SNAPSHOT.size)
+            word_manager = game.WordManager(WORDS)
+            game_logic = game.GameLogic(engine=word_manager.engine)
+            restore(game_logic, data, WORDS)
+            self.assertEqual(game_logic.get_game_state(), self._played(word_id, letters).game_state())
+            self.assertEqual(word_manager.selected_word, WORDS[word_id])
+            self.assertEqual(snapshot(word_manager), data)
+
+    def test_word_guess_win_survives(self):
+        engine = self._played(1, "a")
+        engine.guess_word("java")
+        engine.update_status()
+        restored = unpack_many(pack_many([engine]), WORDS)[0]
+        self.assertEqual(restored.game_state(), engine.game_state())
+
+    def test_pack_many(self):
+        engines = [self._played(i, "etaoin"[:i]) for i in range(len(WORDS))]
+        buffer = pack_many(engines)
+        self.assertEqual(len(buffer), SNAPSHOT.size * len(WORDS))
+        self.assertEqual([engine.game_state() for engine in unpack_many(buffer, WORDS)],
+                         [engine.game_state() for engine in engines])
+
+    def test_errors(self):
+        engine = HangmanEngine()
+        engine.start("abcd")
+        with self.assertRaises(ValueError):
+            snapshot(engine)
+        self.assertEqual(len(snapshot(engine, word_id=1)), SNAPSHOT.size)
+
+
+class _CountingStream(io.StringIO):
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestDisplay(unittest.TestCase):
+
+    def setUp(self):
+        self.word_manager = game.WordManager(["python"])
+        self.word_manager.select_word()
+        self.game_state = game.GameState(engine=self.word_manager.engine)
+        self.display = game.Display()
+
+    def _printed_turn(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.display.display_hangman(self.game_state.remaining_tries)
+            self.display.show_word_state(self.word_manager)
+            self.display.show_guessed_letters(self.game_state)
+            self.display.display_remaining_tries(self.game_state)
+        return output.getvalue()
+
+    def test_render_matches_printed_turn(self):
+        for letter in "zpaqyt":
+            self.game_state.guess_letter(letter, self.word_manager)
+            self.assertEqual(self.display.render_turn(self.game_state, self.word_manager),
+                             self._printed_turn())
+
+    def test_show_turn_writes_once(self):
+        stream = _CountingStream()
+        display = game.Display(redraw=True, stream=stream)
+        display.show_turn(self.game_state, self.word_manager)
+        self.assertEqual(stream.writes, 1)
+        self.assertTrue(stream.getvalue().startswith(game.Display.CLEAR_SCREEN))
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_every_benchmark_runs(self):
+        words = make_words(50)
+        self.assertEqual(words, make_words(50))
+        with tempfile.TemporaryDirectory() as tmp:
+            word_file = os.path.join(tmp, "words.txt")
+            with open(word_file, "w") as f:
+                f.write("\n".join(words))
+            for name, (func, ops) in benchmarks(game, words, word_file).items():
+                self.assertGreater(measure(func, ops, min_time=0, repeat=1), 0, name)
+
+    def test_compare_flags_slowdowns_only(self):
+        baseline = {"a": {"16": 100.0}, "b": {"16": 100.0, "1000": 50.0}}
+        results = {"a": {"16": 119.0}, "b": {"16": 90.0, "1000": 80.0}, "new": {"16": 1.0}}
+        self.assertEqual(compare(results, baseline, threshold=0.2), [("b", "1000", 50.0, 80.0)])
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_overflow_bucket(self):
+        for ns in (0, 3, 1 << 39, 1 << 45):
+            metrics.observe("test_overflow", ns)
+        self.assertEqual(json.loads(metrics.to_json())['phases']['test_overflow'], {
+            'count': 4, 'sum_ns': 3 + (1 << 39) + (1 << 45),
+            'buckets_le_ns': {'1': 1, '4': 1, '+Inf': 2}})
+        lines = [line for line in metrics.to_prometheus().splitlines() if 'test_overflow' in line]
+        self.assertIn('hangman_phase_seconds_bucket{phase="test_overflow",le="549.756"} 2', lines)
+        self.assertIn('hangman_phase_seconds_bucket{phase="test_overflow",le="+Inf"} 4', lines)
+        self.assertIn('hangman_phase_seconds_count{phase="test_overflow"} 4', lines)
+
+    def test_word_guesses_instrumented(self):
+        # A private copy of the game module, so only its classes get wrapped
+        instrumented = load_game_module()
+        self.addCleanup(setattr, metrics, 'enabled', False)
+        instrumented.enable_metrics()
+
+        def validations():
+            histogram = metrics.snapshot()['histograms'].get('validation', [0] * (metrics.SUM + 1))
+            return sum(histogram[:metrics.SUM])
+
+        before = validations()
+        game_logic = instrumented.GameLogic()
+        game_logic.start_new_game("java")
+        game_logic.validate_word_guess("lava")
+        self.assertEqual(validations(), before + 1)
+
+
+class TestSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["python", "jython", "cython", "kotlin", "galaxy", "puzzle",
+                      "java", "lava", "jazz", "mystery"]
+
+    def test_candidates_match_brute_force(self):
+        solver = Solver(self.words)
+        game_logic = game.GameLogic()
+        game_logic.start_new_game("jython")
+        solver.start(6)
+        wrong = []
+        for letter in "ontj":
+            correct, _ = game_logic.make_guess(letter)
+            solver.observe(letter, game_logic.word_state)
+            if not correct:
+                wrong.append(letter)
+            pattern = "".join(c if c in game_logic.guessed_letters else "_" for c in "jython")
+            self.assertEqual(solver.candidate_words(), _brute_force(self.words, pattern, wrong))
+
+    def test_partition_covers_candidates(self):
+        solver = Solver(self.words, 'entropy')
+        solver.start(6)
+        for letter in "aoyz":
+            groups = solver.partition(letter)
+            combined = 0
+            for _, group in groups:
+                self.assertFalse(combined & group)
+                combined |= group
+            self.assertEqual(combined, solver.candidates)
+
+    def test_plays_every_word(self):
+        self.assertEqual(Solver(self.words).strategy, 'min_wrong')
+        for strategy in ('min_wrong', 'entropy'):
+            solver = Solver(WordIndex(self.words), strategy)
+            for word in self.words:
+                game_logic = game.GameLogic()
+                game_logic.start_new_game(word)
+                won, wrong_guesses = solver.play(game_logic)
+                self.assertTrue(won, (strategy, word))
+                self.assertEqual(wrong_guesses, 6 - game_logic.remaining_tries)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            Solver(self.words, 'greedy')
+        solver = Solver(self.words)
+        solver.start(4)
+        solver.guessed = set("abcdefghijklmnopqrstuvwxyz")
+        with self.assertRaises(ValueError):
+            solver.next_guess()
+
+
+class TestDecisionTree(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["python", "jython", "cython", "kotlin", "galaxy", "puzzle",
+                      "java", "lava", "jazz", "mystery"]
+        self.tree = DecisionTree(build_tree(self.words, processes=1))
+
+    def _play(self, word, next_letter):
+        game_logic = game.GameLogic()
+        game_logic.start_new_game(word)
+        letters = []
+        while not game_logic.game_over:
+            letters.append(next_letter(game_logic))
+            game_logic.make_guess(letters[-1])
+            game_logic.update_game_status()
+        return letters
+
+    def test_follows_solver(self):
+        for word in self.words:
+            solver = Solver(self.words, 'entropy')
+            solver.start(len(word))
+
+            def solver_letter(game_logic):
+                for letter in game_logic.guessed_letters - solver.guessed:
+                    solver.observe(letter, game_logic.word_state)
+                return solver.next_guess()
+
+            self.assertEqual(self._play(word, self.tree.best_guess), self._play(word, solver_letter))
+
+    def test_falls_back_off_policy(self):
+        game_logic = game.GameLogic()
+        game_logic.start_new_game("jazz")
+        game_logic.make_guess("z")
+        self.assertIsNone(self.tree.best_guess(game_logic))
+        solver = Solver(self.words, 'entropy')
+        expected = Solver(self.words, 'entropy')
+        expected.start(4)
+        expected.observe("z", game_logic.word_state)
+        self.assertEqual(self.tree.best_guess(game_logic, solver), expected.next_guess())
+        self.assertEqual(self.tree.lookup("_ _ z z", {"z"}, solver), expected.next_guess())
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.tree")
+            save_tree(self.tree.table, path)
+            self.assertEqual(load_tree(path).table, self.tree.table)
+            save_tree({}, path)
+            os.utime(path, ns=(0, 1))
+            self.assertEqual(load_tree(path).table, {})
+
+
+class TestDifficulty(unittest.TestCase):
+
+    def test_scores_independent_of_process_count(self):
+        inline = score_words(WORDS, WORDS, processes=1)
+        self.assertEqual(set(inline), set(WORDS))
+        self.assertTrue(all(0 <= score < 26 for score in inline.values()))
+        self.assertEqual(score_words(WORDS, WORDS + ["Java"] * 2000, processes=2), inline)
+
+    def test_update_scores_keeps_existing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scores.json")
+            self.assertEqual(load_scores(path), {})
+            update_scores(WORDS[:3], path, processes=1)
+            with open(path, "w") as f:
+                json.dump({'version': 1, 'scores': {"python": 99}}, f)
+            scores = update_scores(WORDS, path, processes=1)
+            self.assertEqual(scores["python"], 99)
+            self.assertEqual(load_scores(path), scores)
+            self.assertEqual(set(scores), set(WORDS))
+
+    def test_select_from_band(self):
+        scores = {"python": 1, "java": 3, "kotlin": 3, "galaxy": 5}
+        index = DifficultyIndex(WORDS, scores)
+        self.assertEqual(index.band(3, 3), (1, 3))
+        for _ in range(20):
+            self.assertIn(WORDS[index.select(2, 4)], ("java", "kotlin"))
+        with self.assertRaises(ValueError):
+            index.select(6)
+        word_manager = game.WordManager(WORDS, difficulty=index)
+        word_manager.select_word(max_difficulty=1)
+        self.assertEqual(word_manager.selected_word, "python")
+        with self.assertRaises(ValueError):
+            game.WordManager(WORDS).select_word(min_difficulty=1)
+
+
+class TestEvilEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["python", "jython", "cython", "kotlin", "galaxy", "puzzle",
+                      "java", "lava", "jazz", "mystery"]
+
+    def test_keeps_largest_consistent_family(self):
+        engine = EvilEngine(self.words)
+        game_logic = game.GameLogic(engine=engine)
+        game_logic.start_new_game("xxxxxx")
+        wrong = []
+        for letter in "ytnoz":
+            candidates = engine._solver.candidates
+            largest = max(group.bit_count() for _, group in engine._solver.partition(letter))
+            correct, _ = game_logic.make_guess(letter)
+            game_logic.update_game_status()
+            if not correct:
+                wrong.append(letter)
+            family = engine._solver.candidate_words()
+            self.assertEqual(len(family), largest)
+            self.assertFalse(engine._solver.candidates & ~candidates)
+            self.assertIn(engine.word, family)
+            pattern = " ".join(c if c in game_logic.guessed_letters else "_" for c in engine.word)
+            self.assertEqual(family, _brute_force(self.words, pattern, wrong))
+            self.assertEqual(game_logic.get_game_state()['word_state'], pattern)
+
+    def test_hides_letters_on_ties(self):
+        engine = EvilEngine(["java", "lava", "jazz", "buzz"])
+        engine.start("abcd")
+        self.assertFalse(engine.guess("j"))
+        self.assertEqual(engine._solver.candidate_words(), ["lava", "buzz"])
+        self.assertEqual(engine.remaining_tries, 5)
+
+    def test_no_words_of_length(self):
+        with self.assertRaises(ValueError):
+            EvilEngine(self.words).start("ab")
+
+
+def _alias_probabilities(table):
+    """Exact draw probability of every index implied by the alias tables"""
+    def vose(prob, alias, lo, hi):
+        shares = [0.0] * (hi - lo)
+        for i in range(lo, hi):
+            shares[i - lo] += prob[i]
+            shares[alias[i] - lo] += 1.0 - prob[i]
+        return [share / (hi - lo) for share in shares]
+
+    blocks = vose(list(table.top_prob), list(table.top_alias), 0, len(table.top_prob))
+    result = []
+    for block, block_share in enumerate(blocks):
+        start = block * table.block_size
+        end = min(start + table.block_size, len(table.weights))
+        result += [block_share * share for share in vose(table.prob, table.alias, start, end)]
+    return result
+
+
+class TestAliasTable(unittest.TestCase):
+
+    def assertMatchesWeights(self, table, weights):
+        total = sum(weights)
+        for got, weight in zip(_alias_probabilities(table), weights, strict=True):
+            self.assertAlmostEqual(got, weight / total)
+
+    def test_probabilities_follow_weights(self):
+        weights = [random.Random(i).random() * 5 for i in range(50)] + [0.0]
+        table = AliasTable(weights, block_size=8)
+        self.assertMatchesWeights(table, weights)
+        rng = random.Random(0)
+        self.assertNotIn(50, {table.draw(rng) for _ in range(2000)})
+
+    def test_update_extend_and_copy(self):
+        weights = [1.0] * 20
+        table = AliasTable(weights, block_size=8)
+        snapshot = table.copy()
+        table.update({3: 10.0, 17: 0.0})
+        table.extend([4.0, 2.0])
+        self.assertMatchesWeights(table, weights[:3] + [10.0] + weights[4:17] + [0.0] + weights[18:] + [4.0, 2.0])
+        self.assertMatchesWeights(snapshot, weights)
+
+    def test_draw_many_is_seeded(self):
+        table = AliasTable([1.0, 0.0, 3.0], block_size=2)
+        draws = table.draw_many(4000, seed=5)
+        self.assertTrue((draws == table.draw_many(4000, seed=5)).all())
+        self.assertEqual(set(draws.tolist()), {0, 2})
+        self.assertAlmostEqual((draws == 2).mean(), 0.75, delta=0.03)
+
+    def test_errors(self):
+        for weights in ([], [1.0, -1.0], [0.0, 0.0]):
+            with self.assertRaises(ValueError):
+                AliasTable(weights)
+        with self.assertRaises(ValueError):
+            AliasTable([1.0]).update({0: -2.0})
+
+    def test_load_weights(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = weights_path(os.path.join(tmp, "words.txt"))
+            self.assertEqual(path, os.path.join(tmp, "words.weights"))
+            with open(path, "w") as f:
+                f.write("Python 3.5\njava 0\nbroken line here\n")
+            self.assertEqual(load_weights(["python", "java", "kotlin"], path), [3.5, 0.0, 1.0])
+
+
+class TestShuffleBag(unittest.TestCase):
+
+    def test_permutation(self):
+        for size in (1, 2, 7, 1000, 1025):
+            permutation = FeistelPermutation(size, key=size)
+            self.assertEqual(sorted(permutation[i] for i in range(size)), list(range(size)))
+        self.assertNotEqual([FeistelPermutation(1000, 1)[i] for i in range(10)],
+                            [FeistelPermutation(1000, 2)[i] for i in range(10)])
+        with self.assertRaises(IndexError):
+            FeistelPermutation(5, 0)[5]
+        with self.assertRaises(ValueError):
+            FeistelPermutation(0, 0)
+
+    def test_no_repeats_within_a_pass(self):
+        bag = ShuffleBag(100, seed=42)
+        first = [bag.draw() for _ in range(100)]
+        second = [bag.draw() for _ in range(100)]
+        self.assertEqual(sorted(first), list(range(100)))
+        self.assertEqual(sorted(second), list(range(100)))
+        self.assertNotEqual(first, second)
+
+    def test_resume_from_state(self):
+        bag = ShuffleBag(50, seed=7)
+        for _ in range(73):
+            bag.draw()
+        resumed = ShuffleBag(50, *bag.state())
+        self.assertEqual([resumed.draw() for _ in range(60)], [bag.draw() for _ in range(60)])
+
+    def test_word_manager_rotation(self):
+        word_manager = game.WordManager(WORDS, bag=ShuffleBag(len(WORDS), seed=3))
+        played = []
+        for _ in WORDS:
+            word_manager.select_word()
+            played.append(word_manager.selected_word)
+        self.assertEqual(sorted(played), sorted(WORDS))
+
+
+class TestGameIds(unittest.TestCase):
+
+    def test_select_word_matches_replay(self):
+        word_manager = game.WordManager(WORDS, tries_range=(3, 9))
+        tries = set()
+        for game_id in range(200):
+            word_manager.select_word(game_id=game_id)
+            engine = replay(game_id, [], WORDS, tries_range=(3, 9))
+            self.assertEqual((word_manager.selected_word, word_manager.engine.max_tries,
+                              word_manager.engine.remaining_tries, word_manager.engine.word_id),
+                             (engine.word, engine.max_tries, engine.remaining_tries, engine.word_id))
+            tries.add(engine.max_tries)
+        self.assertEqual(tries, set(range(3, 10)))
+
+    def test_parameters_are_deterministic(self):
+        ids = range(1000)
+        self.assertEqual([game_parameters(i, 10, (4, 8)) for i in ids],
+                         [game_parameters(i, 10, (4, 8)) for i in ids])
+        self.assertNotEqual([game_word_id(i, 10, key=1) for i in ids],
+                            [game_word_id(i, 10, key=2) for i in ids])
+        self.assertEqual(set(game_word_id(i, 10) for i in ids), set(range(10)))
+
+    def test_replay_into_game_logic(self):
+        game_logic = game.GameLogic()
+        word = WORDS[game_word_id(5, len(WORDS))]
+        letters = [word[0].upper(), "q", word[-1]]
+        replay(5, letters, WORDS, game=game_logic)
+        expected = game.GameLogic()
+        expected.start_new_game(word)
+        for letter in letters:
+            if expected.validate_guess(letter)[0]:
+                expected.make_guess(letter)
+                expected.update_game_status()
+        self.assertEqual(game_logic.get_game_state(), expected.get_game_state())
+        with self.assertRaises(ValueError):
+            replay(5, ["q", "q"], WORDS)
+
+
+class TestDawg(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.words = sorted({"".join(rng.choice("abcde") for _ in range(rng.randint(1, 7)))
+                             for _ in range(400)} | {"a" * 70, "ab" * 40})
+        self.dawg = Dawg(self.words + self.words[:20])
+
+    def test_sequence_round_trip(self):
+        self.assertEqual(list(self.dawg), self.words)
+        self.assertEqual(len(self.dawg), len(self.words))
+        self.assertEqual(self.dawg[-1], self.words[-1])
+        self.assertEqual(self.dawg[3:6], self.words[3:6])
+        with self.assertRaises(IndexError):
+            self.dawg[len(self.words)]
+        for word in self.words[::7]:
+            self.assertIn(word, self.dawg)
+        for word in ("", "z", "abcdeab", "a" * 69):
+            self.assertEqual(word in self.dawg, word in self.words)
+
+    def test_shares_suffixes(self):
+        self.assertLess(len(self.dawg.final), sum(map(len, self.words)) // 2)
+
+    def test_match_matches_brute_force(self):
+        for pattern, wrong in (("_ _ _", ()), ("a _ _ e", ("b",)), ("_ c _ _ _", ("a", "e")),
+                               ("_" * 70, ()), ("_" * 80, ("c",)), ("_" * 9, ())):
+            self.assertEqual(self.dawg.match(pattern, wrong), _brute_force(self.words, pattern, wrong))
+
+    def test_words_with_prefix(self):
+        for prefix in ("", "a", "ab", "cde", "eeee", "zz"):
+            self.assertEqual([self.dawg[i] for i in self.dawg.words_with_prefix(prefix)],
+                             [word for word in self.words if word.startswith(prefix)])
+
+    def test_word_manager(self):
+        word_manager = game.WordManager(Dawg(WORDS))
+        word_manager.select_word()
+        self.assertIn(word_manager.selected_word, WORDS)
+
+
+class TestWordGuesses(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "lexicon.bloom")
+        self.lexicon_words = WORDS + ["lava", "Jazz", "café", "ab"]
+
+    def test_lexicon_round_trip(self):
+        lexicon = build_lexicon(self.lexicon_words, self.path, error_rate=0.5)
+        self.addCleanup(lexicon.close)
+        self.assertTrue(os.path.exists(exact_path(self.path)))
+        for word in self.lexicon_words:
+            self.assertIn(word, lexicon)
+            self.assertIn(word.upper(), lexicon)
+        # At a 50% error rate the filter alone would let many of these through
+        rng = random.Random(2)
+        for _ in range(300):
+            word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 7)))
+            self.assertEqual(word in lexicon, word in {w.lower() for w in self.lexicon_words})
+
+    def test_filter_without_exact_index(self):
+        bloom = BloomFilter.for_capacity(100)
+        for word in WORDS:
+            bloom.add(word)
+        bloom.save(self.path)
+        lexicon = Lexicon.load(self.path)
+        self.addCleanup(lexicon.close)
+        self.assertIsNone(lexicon.exact)
+        self.assertTrue(all(word in lexicon for word in WORDS))
+
+    def test_validate_word_guess(self):
+        lexicon = build_lexicon(self.lexicon_words, self.path)
+        self.addCleanup(lexicon.close)
+        game_logic = game.GameLogic(lexicon=lexicon)
+        game_logic.start_new_game("java")
+        self.assertEqual(game_logic.validate_word_guess("Lava"), (True, ""))
+        self.assertFalse(game_logic.make_word_guess("lava")[0])
+        self.assertEqual(game_logic.validate_word_guess("LAVA"), (False, "You already guessed that word."))
+        self.assertEqual(game_logic.validate_word_guess("zzzz"), (False, "That is not a word in the dictionary."))
+        self.assertFalse(game_logic.validate_word_guess("javas")[0])
+        game_logic.start_new_game("java")
+        self.assertTrue(game_logic.validate_word_guess("lava")[0])
+
+    def test_main_rejects_words_without_lexicon(self):
+        letters = iter(["zzzzzzz"] + list("etaoinshrdlcumwfgypbvkjxq"))
+
+        def answer(prompt):
+            return "n" if "play again" in prompt else next(letters)
+
+        output = io.StringIO()
+        with mock.patch("builtins.input", answer), contextlib.redirect_stdout(output):
+            game.main()
+        self.assertIn("Please enter a single letter.", output.getvalue())
+
+    def test_evil_engine_drops_guessed_word(self):
+        engine = EvilEngine(["java", "lava", "jazz", "buzz"])
+        game_logic = game.GameLogic(engine=engine)
+        game_logic.start_new_game("abcd")
+        game_logic.make_guess("a")
+        self.assertEqual(engine._solver.candidate_words(), ["java", "lava"])
+        self.assertFalse(game_logic.make_word_guess(engine.word)[0])
+        self.assertEqual(engine._solver.candidate_words(), ["lava"])
+        self.assertTrue(game_logic.make_word_guess("lava")[0])
+        self.assertEqual(game_logic.update_game_status(), (True, "Congratulations! You won!"))
+
+
+def _attached_words(name):
+    with SharedDictionary.attach(name) as shared:
+        return list(shared), bytes(shared.letter_bitmap("a"))
+
+
+class TestSharedDictionary(unittest.TestCase):
+
+    def setUp(self):
+        self.words = WORDS + ["café", "naïve"]
+        self.shared = SharedDictionary.create(self.words)
+        self.addCleanup(self.shared.close)
+
+    def test_sequence_and_bitmaps(self):
+        self.assertEqual(sorted(self.shared), sorted(self.words))
+        self.assertEqual(sorted(self.shared[i] for i in self.shared.bucket(5)), ["naïve"])
+        for letter in "ayz":
+            bitmap = self.shared.letter_bitmap(letter)
+            for word_id, word in enumerate(self.shared):
+                self.assertEqual(bool(bitmap[word_id >> 3] >> (word_id & 7) & 1), letter in word)
+                self.assertEqual(self.shared.has_letter(word_id, letter), letter in word)
+        self.assertTrue(self.shared.letter_bitmap("a").readonly)
+
+    def test_close_releases_bitmap_views(self):
+        with SharedDictionary.create(WORDS) as shared:
+            bitmap = shared.letter_bitmap("y")
+            self.assertIs(shared.letter_bitmap("y"), bitmap)
+            copy = bytes(bitmap)
+        with self.assertRaises(ValueError):
+            bitmap[0]
+        self.assertEqual(len(copy), 1)
+
+    def test_attach_from_worker(self):
+        with ProcessPoolExecutor(1) as pool:
+            words, bitmap = pool.submit(_attached_words, self.shared.name).result()
+        self.assertEqual(words, list(self.shared))
+        self.assertEqual(bitmap, bytes(self.shared.letter_bitmap("a")))
+
+
+class TestDictionaryWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "words.txt")
+        self._stamp = 0
+
+    def _write(self, words, weights=None):
+        with open(self.path, "w") as f:
+            f.write("\n".join(words) + "\n")
+        if weights is not None:
+            with open(os.path.join(self._tmp.name, "words.weights"), "w") as f:
+                f.write("".join(f"{word} {weight}\n" for word, weight in weights.items()))
+        # Distinct mtimes even when rewrites land in the same clock tick
+        self._stamp += 1
+        os.utime(self.path, ns=(self._stamp * 10 ** 9, self._stamp * 10 ** 9))
+
+    def assertConsistent(self, watcher, expected):
+        version = watcher.current
+        self.assertEqual(sorted(version.words), sorted(expected))
+        self.assertEqual(watcher._positions, {word: i for i, word in enumerate(version.words)})
+        fresh = WordIndex(expected)
+        for pattern in ("____", "______", "_a_a", "p_____"):
+            self.assertEqual(sorted(version.index.query(pattern)), sorted(fresh.query(pattern)))
+        self.assertEqual(len(version.index), len(expected))
+
+    def test_incremental_reload(self):
+        self._write(WORDS)
+        watcher = DictionaryWatcher(self.path)
+        self.assertIsNone(watcher.check())
+        first = watcher.current
+        published = []
+        watcher.subscribe(published.append)
+        self._write(["python", "lava", "kotlin", "jazz", "mystery", "cython"])
+        version = watcher.check()
+        self.assertEqual((version.number, published), (1, [version]))
+        self.assertConsistent(watcher, ["python", "lava", "kotlin", "jazz", "mystery", "cython"])
+        self.assertEqual(sorted(first.words), sorted(WORDS))
+        self.assertEqual(sorted(first.index.query("____")), ["java"])
+
+    def test_duplicate_lines(self):
+        self._write(["java", "Java", "lava", "java", "jazz"])
+        watcher = DictionaryWatcher(self.path)
+        self.assertConsistent(watcher, ["java", "lava", "jazz"])
+        self._write(["lava", "Lava", "jazz"])
+        watcher.check()
+        self.assertConsistent(watcher, ["lava", "jazz"])
+
+    def test_weights_follow_words(self):
+        self._write(WORDS, {"python": 5, "java": 0})
+        watcher = DictionaryWatcher(self.path)
+        self._write(["java", "puzzle", "lava", "jazz"], {"python": 5, "java": 0, "lava": 3})
+        version = watcher.check()
+        probabilities = _alias_probabilities(version.weights)
+        expected = {"java": 0, "puzzle": 1, "lava": 3, "jazz": 1}
+        for i, word in enumerate(version.words):
+            self.assertAlmostEqual(probabilities[i], expected[word] / 5)
+        self.assertEqual(sum(probabilities[len(version.words):]), 0)
+
+    def test_word_manager_switches_atomically(self):
+        small = DictionaryVersion(0, ["java", "lava"], None, AliasTable([1.0, 1.0]))
+        large_words = WORDS * 50
+        large = DictionaryVersion(1, large_words, None, AliasTable([1.0] * len(large_words)))
+        bag = ShuffleBag(2, seed=1)
+        word_manager = game.WordManager(small.words, weights=small.weights, bag=bag)
+        for _ in range(3):
+            word_manager.select_word()
+        word_manager.use(large)
+        self.assertEqual((word_manager.bag.seed, word_manager.bag.drawn, word_manager.bag.size),
+                         (1, 3, len(large_words)))
+
+        word_manager = game.WordManager(small.words, weights=small.weights)
+        stop = threading.Event()
+
+        def swap():
+            while not stop.is_set():
+                word_manager.use(large)
+                word_manager.use(small)
+
+        thread = threading.Thread(target=swap)
+        thread.start()
+        try:
+            for _ in range(20000):
+                word_manager.select_word()
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_word_manager_keeps_difficulty(self):
+        self._write(WORDS)
+        watcher = DictionaryWatcher(self.path)
+        difficulty = DifficultyIndex(watcher.current.words, {"python": 1, "java": 3, "lava": 3, "jazz": 6})
+        word_manager = game.WordManager(watcher.current.words, difficulty=difficulty)
+        watcher.subscribe(word_manager.use)
+        self._write(["jazz", "lava", "kotlin", "python"])
+        watcher.check()
+        self.assertEqual(word_manager.difficulty.band(), (0, 3))
+        for _ in range(20):
+            word_manager.select_word(2, 6)
+            self.assertIn(word_manager.selected_word, ("lava", "jazz"))
+        word_manager.select_word(max_difficulty=1)
+        self.assertEqual(word_manager.selected_word, "python")
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "events")
+        self.words = WORDS + ["café"]
+
+    def _play(self, log, plays):
+        """Play [(word_id, guesses)] in one session each; a guess longer than one letter is a word guess"""
+        games = {}
+        for word_id, guesses in plays:
+            game_logic = game.GameLogic(log=log)
+            game_logic.start_new_game(self.words[word_id], word_id=word_id)
+            for guess in guesses:
+                if len(guess) > 1:
+                    game_logic.make_word_guess(guess)
+                elif game_logic.validate_guess(guess)[0]:
+                    game_logic.make_guess(guess)
+                game_logic.update_game_status()
+            games[game_logic.session_id] = game_logic
+        return games
+
+    def assertRecovered(self, games):
+        recovered = replay_log(self.path, self.words)
+        for session_id, game_logic in games.items():
+            restored = game.GameLogic()
+            restore(restored, recovered.snapshot(session_id), self.words)
+            self.assertEqual(restored.get_game_state(), game_logic.get_game_state())
+        return recovered
+
+    def test_replay_matches_games(self):
+        log = EventLog(self.path, self.words, commit_every=3, segment_records=5)
+        games = self._play(log, [(0, "pyth"), (1, "zqwxvb"), (2, ["kotlin"]), (6, "cafe"),
+                                 (6, ["cafe", "café"]), (5, "mysterz")])
+        log.close()
+        self.assertGreater(len(segments(self.path)), 1)
+        recovered = self.assertRecovered(games)
+        self.assertEqual(sorted(recovered.unfinished().tolist()),
+                         sorted(i for i, g in games.items() if not g.game_over))
+        with self.assertRaises(KeyError):
+            recovered.snapshot(99)
+
+    def test_compaction_keeps_unfinished_games(self):
+        log = EventLog(self.path, self.words, commit_every=1, segment_records=4)
+        games = self._play(log, [(0, "python"), (3, "ga"), (1, "zqwxvbn"), (4, "pu"), (6, "caf")])
+        before = sum(os.path.getsize(file) for file in segments(self.path))
+        log.compact()
+        log.close()
+        self.assertLess(sum(os.path.getsize(file) for file in segments(self.path)), before)
+        unfinished = {i: g for i, g in games.items() if not g.game_over}
+        self.assertRecovered(unfinished)
+        compact(self.path, self.words)
+        self.assertEqual(sorted(replay_log(self.path, self.words).session_ids.tolist()), sorted(unfinished))
+
+    def test_session_ids_not_reused_after_compaction(self):
+        log = EventLog(self.path, self.words)
+        games = self._play(log, [(0, "python"), (1, "java")])
+        log.close()
+        compact(self.path, self.words)
+        self.assertEqual(len(replay_log(self.path, self.words)), 0)
+        log = EventLog(self.path, self.words)
+        self.addCleanup(log.close)
+        self.assertGreater(log.new_session(), max(games))
+
+    def test_word_manager_games_are_logged(self):
+        log = EventLog(self.path, self.words)
+        word_manager = game.WordManager(self.words)
+        word_manager.select_word()
+        game_logic = game.GameLogic(engine=word_manager.engine, log=log)
+        game_state = game.GameState(engine=word_manager.engine)
+        word = word_manager.selected_word
+        game_state.guess_letter(word[0].upper(), word_manager)
+        game_logic.make_guess("q" if "q" not in word else "z")
+        game_state.guess_letter("1", word_manager)
+        self.assertEqual(game_logic.remaining_tries, 4)
+        games = {game_logic.session_id: game_logic}
+        log.commit()
+        self.assertRecovered(games)
+        word_manager.select_word(game_id=7)
+        game_logic.make_word_guess("x" * len(word_manager.selected_word))
+        log.close()
+        self.assertEqual(game_logic.remaining_tries, 5)
+        self.assertRecovered(games)
+
+    def test_restored_game_continues_its_session(self):
+        log = EventLog(self.path, self.words)
+        games = self._play(log, [(0, "pyz")])
+        session_id, = games
+        game_logic = game.GameLogic(log=log, session_id=session_id)
+        restore(game_logic, snapshot(games[session_id]), self.words)
+        game_logic.make_guess("t")
+        log.close()
+        self.assertEqual(game_logic.get_game_state()["word_state"], "p y t _ _ _")
+        self.assertRecovered({session_id: game_logic})
+
+    def test_torn_tail_is_ignored(self):
+        log = EventLog(self.path, self.words)
+        games = self._play(log, [(0, "pyt")])
+        log.close()
+        with open(segments(self.path)[-1], "ab") as f:
+            f.write(b"\x01\x02\x03")
+        log = EventLog(self.path, self.words)
+        games.update(self._play(log, [(2, "kot")]))
+        log.close()
+        self.assertRecovered(games)
+
+
+class _FailingConnection:
+    """Proxy for a sqlite3 connection whose first `failures` writes raise"""
+
+    def __init__(self, db, failures):
+        self._db = db
+        self.failures = failures
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def __enter__(self):
+        return self._db.__enter__()
+
+    def __exit__(self, *exc):
+        return self._db.__exit__(*exc)
+
+    def executemany(self, sql, rows):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return self._db.executemany(sql, rows)
+
+
+class TestStatsStore(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "stats.db")
+
+    def _open(self, **kwargs):
+        stats = StatsStore(self.path, **kwargs)
+        self.addCleanup(stats.close)
+        return stats
+
+    def test_reopen(self):
+        stats = StatsStore(self.path, top_n=2, flush_interval=60)
+        for player, wins in [("ade", 3), ("bo", 1), ("cy", 2)]:
+            for _ in range(wins):
+                stats.record_game(player, "python", won=True, wrong_guesses=1)
+        stats.record_game("bo", "java", won=False, wrong_guesses=6)
+        self.assertEqual(stats.leaderboard(), [])
+        stats.close()
+
+        stats = self._open(top_n=2, flush_interval=60)
+        self.assertEqual(stats.leaderboard(), [("ade", 3), ("cy", 2)])
+        bo = stats.player("bo")
+        self.assertEqual(bo.row(), (1, 1, 0, 1, 7))
+        self.assertIsNone(stats.player("nobody"))
+        self.assertEqual(stats.word("python").wins, 6)
+
+        # A stored player climbs the board from their stored wins
+        for _ in range(3):
+            stats.record_game("bo", "java", won=True, wrong_guesses=0)
+        self.assertEqual(stats.word("java").row(), (3, 1, 6))
+        stats.flush()
+        self.assertEqual(stats.leaderboard(), [("bo", 4), ("ade", 3)])
+
+    def test_merged_streaks_match_game_by_game(self):
+        rng = random.Random(3)
+        stats = self._open(flush_interval=60)
+        expected = {}
+        for i in range(300):
+            player = rng.choice("abc")
+            won = rng.random() < 0.7
+            expected.setdefault(player, PlayerStats()).record(won, 1)
+            stats.record_game(player, "python", won, 1)
+            if rng.random() < 0.1:
+                stats.flush()
+            if i % 50 == 49:
+                # Stored rows plus the pending deltas, then the stored rows alone
+                for name in expected:
+                    self.assertEqual(stats.player(name).row(), expected[name].row())
+                stats.flush()
+                for name in expected:
+                    self.assertEqual(stats.player(name).row(), expected[name].row())
+
+    def test_record_game_does_not_wait_for_a_flush(self):
+        stats = self._open(flush_interval=60)
+        recorded = threading.Event()
+        with stats._db_lock:  # as held by a flush writing to disk
+            thread = threading.Thread(target=lambda: (stats.record_game("ade", "python", True, 0),
+                                                      recorded.set()))
+            thread.start()
+            self.assertTrue(recorded.wait(5))
+        thread.join()
+        self.assertEqual(stats.player("ade").wins, 1)
+
+    def test_failed_flush_keeps_deltas(self):
+        stats = self._open(flush_interval=60)
+        stats.record_game("ade", "python", won=True, wrong_guesses=2)
+        stats.flush()
+        stats.record_game("ade", "python", won=True, wrong_guesses=0)
+        stats._db = _FailingConnection(stats._db, failures=1)
+        with self.assertRaises(sqlite3.OperationalError):
+            stats.flush()
+        self.assertEqual(stats.leaderboard(), [("ade", 1)])
+        stats.record_game("ade", "java", won=False, wrong_guesses=6)
+        stats.record_game("bo", "java", won=False, wrong_guesses=6)
+        stats.flush()
+        rows = stats._db.execute("SELECT * FROM players ORDER BY name").fetchall()
+        self.assertEqual(rows, [("ade", 2, 1, 0, 2, 8), ("bo", 0, 1, 0, 0, 6)])
+        self.assertEqual(stats._db.execute("SELECT * FROM words ORDER BY word").fetchall(),
+                         [("java", 0, 2, 12), ("python", 2, 0, 2)])
+        self.assertEqual(stats.leaderboard(), [("ade", 2)])
+
+    def test_background_flush_survives_errors(self):
+        stats = self._open(flush_interval=0.01)
+        stats._db = _FailingConnection(stats._db, failures=2)
+        with self.assertLogs("hangman_stats", "ERROR"):
+            stats.record_game("ade", "python", won=True, wrong_guesses=2)
+            for _ in range(200):
+                if stats._db.failures == 0:
+                    break
+                threading.Event().wait(0.01)
+        self.assertTrue(stats._thread.is_alive())
+        for _ in range(200):
+            with stats._db_lock:
+                row = stats._db.execute("SELECT wins FROM players WHERE name = 'ade'").fetchone()
+            if row:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(row, (1,))
+
+
+if __name__ == "__main__":
+    unittest.main()